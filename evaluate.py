@@ -1,6 +1,16 @@
 """This module defines functions that replicate Python's builtin eval()"""
 
+import functools
+import itertools
+import operator
+import os
 import re
+import tempfile
+from collections import deque, namedtuple
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 
 # Regular expression patterns
@@ -12,6 +22,44 @@ ADD_SUB_RE = re.compile(
     rf'({NUMBER_PATTERN}) \s* ([+-]) \s* ({NUMBER_PATTERN})', flags=re.VERBOSE
 )
 
+# Tokens of compiled equations: anything that is not a number,
+# variable name, operator or parenthesis is an error token
+TOKEN_RE = re.compile(r"""
+    \s* (?:
+        (?P<number> (?: \d+ (?:[.]\d*)? | [.]\d+ ) (?:[eE][-+]?\d+)? )
+      | (?P<name> [A-Za-z_]\w* )
+      | (?P<operator> [-+*/()] )
+      | (?P<error> \S )
+    )""", flags=re.VERBOSE)
+
+# Operators of compiled equations and how tightly they bind their operands
+BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+UNARY_OPERATORS = {
+    '+': operator.pos,
+    '-': operator.neg,
+}
+BINDING_POWERS = {'+': 10, '-': 10, '*': 20, '/': 20}
+UNARY_BINDING_POWER = 30
+
+# How compiled equations are evaluated: by walking the tree, by running
+# a flat postfix program on a stack machine, or as a generated lambda
+EQUATION_BACKENDS = ('tree', 'stack', 'lambda')
+DEFAULT_EQUATION_BACKEND = 'stack'
+
+# Instructions of the stack machine
+PUSH_CONSTANT, PUSH_VARIABLE, APPLY_UNARY, APPLY_BINARY = range(4)
+
+# Number of compiled equations evaluate_equation remembers by default
+DEFAULT_EQUATION_CACHE_SIZE = 1024
+
+# Lines of a file that evaluate_file hands to a worker process at a time
+FILE_CHUNK_SIZE = 10_000
+
 
 def _evaluate_binary(match_obj):
 
@@ -36,7 +84,7 @@ def _evaluate_binary(match_obj):
     raise ValueError('Invalid operator')
 
 
-def evaluate_equation_regex(equation):
+def _evaluate_equation_regex(equation):
     """Evaluate a mathematical equation using regular expressions"""
 
     # If used recursively, argument would be regex match object
@@ -48,7 +96,7 @@ def evaluate_equation_regex(equation):
 
     # Evaluate all parenthetical components
     while PARENTHESIS_RE.search(equation):
-        equation = PARENTHESIS_RE.sub(evaluate_equation_regex, equation)
+        equation = PARENTHESIS_RE.sub(_evaluate_equation_regex, equation)
 
     # Multiplication and divison have order precedence
     while MULT_DIV_RE.search(equation):
@@ -91,7 +139,7 @@ def _get_operator_and_right_factor(equation, right_factor=1):
     return op, right_factor
 
 
-def evaluate_equation(equation):
+def _evaluate_equation(equation):
     """Evaluate a mathematical equation just using Python builtins"""
     equation = equation.strip()
 
@@ -106,12 +154,12 @@ def evaluate_equation(equation):
 
     # If the equation ends in a parenthetical statement,
     # evaluate the right-most inner parenthetical statement (middle_part)
-    # evaluate_equation(middle_part) could be negative
+    # _evaluate_equation(middle_part) could be negative
     if equation.endswith(')'):
         left_part, right_part = equation.rsplit('(', 1)
         middle_part, right_part = right_part.split(')', 1)
-        new_equation = left_part + str(evaluate_equation(middle_part)) + right_part
-        return evaluate_equation(new_equation)
+        new_equation = left_part + str(_evaluate_equation(middle_part)) + right_part
+        return _evaluate_equation(new_equation)
 
     op, right_factor = _get_operator_and_right_factor(equation)
 
@@ -119,17 +167,480 @@ def evaluate_equation(equation):
     left_part, right_part = equation.rsplit(op, 1)
 
     if op == '+':
-        return evaluate_equation(left_part) + right_factor*evaluate_equation(right_part)
+        return _evaluate_equation(left_part) + right_factor*_evaluate_equation(right_part)
     if op == '-':
-        return evaluate_equation(left_part) - right_factor*evaluate_equation(right_part)
+        return _evaluate_equation(left_part) - right_factor*_evaluate_equation(right_part)
     if op == '*':
-        return evaluate_equation(left_part) * right_factor*evaluate_equation(right_part)
+        return _evaluate_equation(left_part) * right_factor*_evaluate_equation(right_part)
     if op == '/':
-        return evaluate_equation(left_part) / right_factor*evaluate_equation(right_part)
+        return _evaluate_equation(left_part) / right_factor*_evaluate_equation(right_part)
 
     return None
 
 
+Token = namedtuple('Token', ['kind', 'text', 'position'])
+
+
+def _tokenize(equation):
+    """Split an equation into tokens in a single pass, ending with an 'end' token"""
+
+    for match in TOKEN_RE.finditer(equation):
+        kind = match.lastgroup
+        if kind == 'error':
+            raise ValueError(f'Unexpected character {match.group(kind)!r} '
+                             f'at position {match.start(kind)}')
+        yield Token(kind, match.group(kind), match.start(kind))
+    yield Token('end', '', len(equation))
+
+
+class Constant(namedtuple('Constant', ['value'])):
+    """Number in a parsed equation"""
+
+    __slots__ = ()
+
+    def evaluate(self, variables):
+        """Value of the node"""
+        del variables
+        return self.value
+
+
+class Variable(namedtuple('Variable', ['name'])):
+    """Named variable in a parsed equation"""
+
+    __slots__ = ()
+
+    def evaluate(self, variables):
+        """Value of the node"""
+        try:
+            return variables[self.name]
+        except KeyError:
+            raise ValueError(f'No value given for variable {self.name!r}') from None
+
+
+class UnaryOperation(namedtuple('UnaryOperation', ['op', 'operand'])):
+    """Unary plus or minus in a parsed equation"""
+
+    __slots__ = ()
+
+    def evaluate(self, variables):
+        """Value of the node"""
+        return UNARY_OPERATORS[self.op](self.operand.evaluate(variables))
+
+
+class BinaryOperation(namedtuple('BinaryOperation', ['op', 'left', 'right'])):
+    """Arithmetic operation on two operands in a parsed equation"""
+
+    __slots__ = ()
+
+    def evaluate(self, variables):
+        """Value of the node"""
+        return BINARY_OPERATORS[self.op](self.left.evaluate(variables),
+                                         self.right.evaluate(variables))
+
+
+def _fold(node):
+    """Replace an operation on constants by its value
+
+    Folding while parsing works bottom-up, so every constant subexpression
+    is evaluated once at compile time. Division by zero is left unfolded
+    to raise when the equation is evaluated.
+    """
+
+    operands = (node.operand,) if isinstance(node, UnaryOperation) else node[1:]
+    if all(isinstance(operand, Constant) for operand in operands):
+        try:
+            return Constant(node.evaluate({}))
+        except ZeroDivisionError:
+            pass
+    return node
+
+
+class _Parser:
+    """Operator-precedence (shunting-yard) parser from tokens to a tree of nodes
+
+    Operands and pending operators are kept on explicit stacks rather than
+    the call stack, so nesting depth is limited only by memory. A pending
+    operator is applied once an operator that binds no tighter follows it.
+    """
+
+    def __init__(self, equation):
+        self.tokens = _tokenize(equation)
+        self.operands = []
+        # (token, binding power, whether unary); '(' has power 0
+        self.operators = []
+
+    @staticmethod
+    def _unexpected(token):
+        if token.kind == 'end':
+            return ValueError('Unexpected end of equation')
+        return ValueError(f'Unexpected {token.text!r} at position {token.position}')
+
+    def parse(self):
+        """Tree of the whole equation"""
+        expect_operand = True
+        for token in self.tokens:
+            expect_operand = self._operand(token) if expect_operand else self._operator(token)
+        return self.operands.pop()
+
+    def _operand(self, token):
+        """Handle a token where an operand is expected, and return
+        whether an operand is still expected"""
+        if token.kind == 'number':
+            text = token.text
+            self.operands.append(
+                Constant(float(text) if any(char in text for char in '.eE') else int(text)))
+            return False
+        if token.kind == 'name':
+            self.operands.append(Variable(token.text))
+            return False
+        if token.text == '(':
+            self.operators.append((token, 0, False))
+            return True
+        if token.text in UNARY_OPERATORS:
+            self.operators.append((token, UNARY_BINDING_POWER, True))
+            return True
+        raise self._unexpected(token)
+
+    def _operator(self, token):
+        """Handle a token following an operand, and return whether
+        an operand is expected next"""
+        if token.kind == 'operator' and token.text in BINDING_POWERS:
+            power = BINDING_POWERS[token.text]
+            self._apply(power)
+            self.operators.append((token, power, False))
+            return True
+        if token.text != ')' and token.kind != 'end':
+            raise self._unexpected(token)
+
+        self._apply(1)
+        if token.kind == 'end' and self.operators:
+            raise self._unexpected(token)
+        if token.text == ')':
+            if not self.operators:
+                raise self._unexpected(token)
+            self.operators.pop()
+        return False
+
+    def _apply(self, min_power):
+        """Apply the pending operators that bind at least min_power"""
+        while self.operators and self.operators[-1][1] >= min_power:
+            token, _, unary = self.operators.pop()
+            right = self.operands.pop()
+            if unary:
+                self.operands.append(_fold(UnaryOperation(token.text, right)))
+            else:
+                left = self.operands.pop()
+                self.operands.append(_fold(BinaryOperation(token.text, left, right)))
+
+
+def _walk(tree, right_first=False):
+    """Nodes of a tree, each before its operands, without recursion"""
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        yield node
+        if isinstance(node, UnaryOperation):
+            pending.append(node.operand)
+        elif isinstance(node, BinaryOperation):
+            pending.extend((node.left, node.right) if right_first else (node.right, node.left))
+
+
+def _variable_names(tree):
+    """Names of the variables in a tree, in order of first appearance"""
+    names = (node.name for node in _walk(tree) if isinstance(node, Variable))
+    return list(dict.fromkeys(names))
+
+
+def _postfix_program(tree):
+    """Flat list of (instruction, argument) pairs that computes the tree on a stack"""
+    program = []
+    for node in _walk(tree, right_first=True):
+        if isinstance(node, Constant):
+            program.append((PUSH_CONSTANT, node.value))
+        elif isinstance(node, Variable):
+            program.append((PUSH_VARIABLE, node.name))
+        elif isinstance(node, UnaryOperation):
+            program.append((APPLY_UNARY, UNARY_OPERATORS[node.op]))
+        else:
+            program.append((APPLY_BINARY, BINARY_OPERATORS[node.op]))
+    program.reverse()
+    return program
+
+
+def _stack_backend(tree):
+    """Evaluate function running the postfix program of a tree on a stack machine"""
+
+    program = _postfix_program(tree)
+
+    def evaluate(variables):
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for instruction, argument in program:
+            if instruction == PUSH_CONSTANT:
+                push(argument)
+            elif instruction == APPLY_BINARY:
+                right = pop()
+                stack[-1] = argument(stack[-1], right)
+            elif instruction == PUSH_VARIABLE:
+                try:
+                    push(variables[argument])
+                except KeyError:
+                    raise ValueError(f'No value given for variable {argument!r}') from None
+            else:
+                stack[-1] = argument(stack[-1])
+        return stack[0]
+
+    return evaluate
+
+
+def _tree_backend(tree):
+    """Evaluate function walking a tree with a recursive method call per node"""
+
+    def evaluate(variables):
+        try:
+            return tree.evaluate(variables)
+        except RecursionError:
+            raise ValueError("Equation is too deeply nested for the 'tree' backend, "
+                             "use 'stack'") from None
+
+    return evaluate
+
+
+def _lambda_source(node, constants):
+    """Python source of a tree, with constants bound to names in constants"""
+    if isinstance(node, Constant):
+        name = f'c{len(constants)}'
+        constants[name] = node.value
+        return name
+    if isinstance(node, Variable):
+        return f'v[{node.name!r}]'
+    if isinstance(node, UnaryOperation):
+        return f'{node.op}({_lambda_source(node.operand, constants)})'
+    left = _lambda_source(node.left, constants)
+    right = _lambda_source(node.right, constants)
+    return f'({left} {node.op} {right})'
+
+
+def _lambda_backend(tree):
+    """Evaluate function compiled from a generated Python lambda"""
+
+    constants = {}
+    try:
+        source = f'lambda v: {_lambda_source(tree, constants)}'
+        function = eval(compile(source, '<equation>', 'eval'),  # pylint: disable=eval-used
+                        {'__builtins__': {}, **constants})
+    except (RecursionError, SyntaxError, MemoryError):
+        raise ValueError("Equation is too deeply nested for the 'lambda' backend, "
+                         "use 'stack'") from None
+
+    def evaluate(variables):
+        try:
+            return function(variables)
+        except KeyError as error:
+            raise ValueError(f'No value given for variable {error.args[0]!r}') from None
+
+    return evaluate
+
+
+class CompiledEquation:
+    """Equation parsed once into a tree, to be evaluated any number of times
+
+    The equation is tokenized in a single pass and parsed by a Pratt parser,
+    so compiling takes time linear in its length and evaluating it only
+    walks the tree, in which constant subexpressions are already folded.
+    Raises ValueError if the equation is malformed.
+
+    Equations may contain named variables, whose values are passed to
+    evaluate() as a mapping or to the call as keyword arguments. Values
+    may be NumPy arrays, so evaluate_columns() computes a whole column
+    of results with one vectorized pass over the tree.
+
+    backend selects how the tree is evaluated:
+    'stack' (the default) flattens it into a postfix program run by a
+    stack machine loop, which handles trees of any depth;
+    'tree' walks it with a recursive method call per node;
+    'lambda' generates and compiles a Python lambda, which is fastest.
+    The last two raise ValueError for trees too deep for the Python
+    interpreter or compiler.
+    """
+
+    __slots__ = ('equation', 'tree', 'variables', 'backend', '_evaluate')
+
+    def __init__(self, equation, backend=DEFAULT_EQUATION_BACKEND):
+        if backend not in EQUATION_BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {EQUATION_BACKENDS}')
+        self.equation = equation
+        self.tree = _Parser(equation).parse()
+        self.variables = tuple(_variable_names(self.tree))
+        self.backend = backend
+        if backend == 'stack':
+            self._evaluate = _stack_backend(self.tree)
+        elif backend == 'lambda':
+            self._evaluate = _lambda_backend(self.tree)
+        else:
+            self._evaluate = _tree_backend(self.tree)
+
+    def __repr__(self):
+        if self.backend == DEFAULT_EQUATION_BACKEND:
+            return f'{type(self).__name__}({self.equation!r})'
+        return f'{type(self).__name__}({self.equation!r}, backend={self.backend!r})'
+
+    def evaluate(self, variables=None):
+        """Value of the equation given a mapping of variable values"""
+        return self._evaluate({} if variables is None else variables)
+
+    def __call__(self, **variables):
+        return self.evaluate(variables)
+
+    def evaluate_columns(self, data):
+        """Evaluate the equation for every row of data in one vectorized pass
+
+        data is a mapping from variable names to columns, a structured array
+        with a field per variable, or a plain array of values when the
+        equation has at most one variable. Returns an array with a result
+        per row, the rows being those of all the mapping's columns (which
+        must broadcast together) or of the array; as in NumPy, division
+        by zero gives inf or nan, not an error.
+        """
+
+        if isinstance(data, Mapping):
+            if not data:
+                raise ValueError('No columns given to evaluate the equation on')
+            columns = {name: np.asarray(data[name]) for name in self.variables if name in data}
+            shape = np.broadcast_shapes(*map(np.shape, data.values()))
+        else:
+            data = np.asarray(data)
+            if data.dtype.names is not None:
+                columns = {name: data[name] for name in self.variables if name in data.dtype.names}
+            elif len(self.variables) <= 1:
+                columns = dict.fromkeys(self.variables, data)
+            else:
+                raise ValueError(f'A plain array cannot hold the {len(self.variables)} '
+                                 f'variables {self.variables}; pass a mapping of columns')
+            shape = data.shape
+
+        result = np.asarray(self.evaluate(columns))
+        return result if result.shape == shape else np.broadcast_to(result, shape).copy()
+
+
+def compile_equation(equation, backend=DEFAULT_EQUATION_BACKEND):
+    """Compile an equation for repeated evaluation with the given backend"""
+    return CompiledEquation(equation, backend)
+
+
+@functools.lru_cache(maxsize=DEFAULT_EQUATION_CACHE_SIZE)
+def _compile_normalized(key):
+    """Compiled form of a whitespace-normalized equation, cached by LRU"""
+    return CompiledEquation(key)
+
+
+def cached_equation(equation):
+    """Compiled form of equation, parsed only if it is not in the LRU cache
+
+    Equations that differ only in whitespace share a cache entry. Malformed
+    equations are not cached, and their errors refer to the equation as given.
+    """
+    try:
+        return _compile_normalized(' '.join(equation.split()))
+    except ValueError:
+        return CompiledEquation(equation)
+
+
+def equation_cache_info():
+    """Hit, miss and size statistics of the equation cache"""
+    return _compile_normalized.cache_info()
+
+
+def clear_equation_cache():
+    """Forget all cached equations and reset the statistics"""
+    _compile_normalized.cache_clear()
+
+
+def resize_equation_cache(maxsize):
+    """Replace the equation cache by an empty one holding at most maxsize
+    equations; None means unbounded and 0 disables caching"""
+    global _compile_normalized  # pylint: disable=global-statement
+    _compile_normalized = functools.lru_cache(maxsize=maxsize)(_compile_normalized.__wrapped__)
+
+
+def evaluate_equation(equation):
+    """Evaluate a mathematical equation, parsing each distinct equation only once
+
+    Compiled equations come from cached_equation, so a repeated equation
+    costs a dictionary lookup; its constant value is folded at compile time.
+    """
+    return cached_equation(equation).evaluate()
+
+
+# Deprecated alias: the regular-expression evaluator re-parsed the equation
+# on every call and remains available as _evaluate_equation_regex
+evaluate_equation_regex = evaluate_equation
+
+
+FileSummary = namedtuple('FileSummary', ['lines', 'errors'])
+
+
+def _evaluate_lines(lines):
+    """Output text for a chunk of equation lines and the number of malformed ones"""
+
+    output = []
+    errors = 0
+    for line in lines:
+        try:
+            output.append(f'{evaluate_equation(line)}\n')
+        except (ValueError, ArithmeticError) as error:
+            output.append(f'ERROR: {error}\n')
+            errors += 1
+    return ''.join(output), errors
+
+
+def evaluate_file(input_path, output_path, chunk_size=FILE_CHUNK_SIZE,
+                  workers=None, max_pending=None):
+    """Evaluate a file of newline-delimited equations into a file of results
+
+    The input is read lazily in chunks of chunk_size lines, which are
+    evaluated on a pool of worker processes. At most max_pending chunks
+    (default twice the number of workers) are in flight, and results are
+    written in input order as soon as they are ready, so memory stays
+    bounded however large the file is. Each line of the output is the
+    value of the corresponding equation, or 'ERROR: message' if it is
+    malformed. Returns a FileSummary of the line and error counts.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    lines = errors = 0
+
+    with open(input_path, encoding='utf-8') as source, \
+            open(output_path, 'w', encoding='utf-8') as target:
+        chunks = iter(lambda: list(itertools.islice(source, chunk_size)), [])
+
+        def write(chunk, result):
+            nonlocal lines, errors
+            target.write(result[0])
+            lines += len(chunk)
+            errors += result[1]
+
+        if workers <= 1:
+            for chunk in chunks:
+                write(chunk, _evaluate_lines(chunk))
+            return FileSummary(lines, errors)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((chunk, executor.submit(_evaluate_lines, chunk)))
+                if len(pending) >= max_pending:
+                    done_chunk, future = pending.popleft()
+                    write(done_chunk, future.result())
+            while pending:
+                done_chunk, future = pending.popleft()
+                write(done_chunk, future.result())
+
+    return FileSummary(lines, errors)
+
+
 if __name__ == '__main__':
 
     print('Starting evaluate.py tests...')
@@ -148,10 +659,16 @@ if __name__ == '__main__':
         try:
             assert evaluate_equation(eq) == eval(eq)
             assert evaluate_equation_regex(eq) == eval(eq)
+            assert _evaluate_equation(eq) == eval(eq)
+            assert _evaluate_equation_regex(eq) == eval(eq)
+            assert compile_equation(eq)() == eval(eq)
         except AssertionError:
             print(f'Incorrect return for equation: {eq}')
             print(f'evaluate_equation: {evaluate_equation(eq)}')
             print(f'evaluate_equation_regex: {evaluate_equation_regex(eq)}')
+            print(f'_evaluate_equation: {_evaluate_equation(eq)}')
+            print(f'_evaluate_equation_regex: {_evaluate_equation_regex(eq)}')
+            print(f'compile_equation: {compile_equation(eq)()}')
             print(f'Expected: {eval(eq)}')
             raise
 
@@ -159,6 +676,142 @@ if __name__ == '__main__':
     FLOAT_EQUATION = '3.2 - 10 * (4.9 + 8.5)'
     assert evaluate_equation(FLOAT_EQUATION) == eval(FLOAT_EQUATION)
     assert evaluate_equation_regex(FLOAT_EQUATION) == eval(FLOAT_EQUATION)
+    assert _evaluate_equation(FLOAT_EQUATION) == eval(FLOAT_EQUATION)
+    assert _evaluate_equation_regex(FLOAT_EQUATION) == eval(FLOAT_EQUATION)
+    assert compile_equation(FLOAT_EQUATION)() == eval(FLOAT_EQUATION)
+
+    # Test compiled equations beyond what the other evaluators support
+    compiled_equations = [
+        '-(2 + 3) * -4',
+        '8 / 4 / 2 - 2 - 3',
+        '- - 3 * 2',
+        '1.5e3 / .5 + 2E-1',
+        '((((7))))',
+        ' 12 * (3 + 4) / (1 - 3) ',
+    ]
+    for eq in compiled_equations:
+        for backend_name in EQUATION_BACKENDS:
+            assert compile_equation(eq, backend_name)() == eval(eq), (eq, backend_name)
+    compiled = compile_equation('3 - 10 * (4 + 8)')
+    assert compiled() == compiled.evaluate() == -117
+
+    # Test variables and vectorized evaluation of columns
+    compiled = compile_equation('(price - cost) * units / 2 + price')
+    assert compiled.variables == ('price', 'cost', 'units')
+    row = {'price': 7, 'cost': 3, 'units': 5}
+    assert compiled(**row) == compiled.evaluate(row) == (7 - 3) * 5 / 2 + 7
+    rng = np.random.default_rng(0)
+    table = {name: rng.integers(1, 100, size=1000) for name in compiled.variables}
+    expected = [compiled.evaluate(dict(zip(table, values))) for values in zip(*table.values())]
+    assert np.allclose(compiled.evaluate_columns(table), expected)
+    records = np.zeros(1000, dtype=[(name, np.int64) for name in table])
+    for field, column in table.items():
+        records[field] = column
+    assert np.allclose(compiled.evaluate_columns(records), expected)
+    x = np.linspace(-1, 1, 101)
+    assert np.allclose(compile_equation('3 * x * x - 2 * x + 1').evaluate_columns(x),
+                       3 * x * x - 2 * x + 1)
+    assert np.array_equal(compile_equation('2 + 3').evaluate_columns(x), np.full(101, 5))
+    assert compile_equation('2 + 3').evaluate_columns({'a': np.arange(3)}).tolist() == [5] * 3
+    for backend_name in EQUATION_BACKENDS:
+        compiled = compile_equation('(price - cost) * -units / 2 + price', backend_name)
+        assert compiled(**row) == -(7 - 3) * 5 / 2 + 7
+        assert np.allclose(compiled.evaluate_columns(table), 2 * table['price'] - expected)
+        for partial_row in [{}, {'price': 1, 'cost': 2}]:
+            try:
+                compiled.evaluate(partial_row)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f'Missing variable evaluated: {partial_row}')
+
+    # Test backends on trees deeper than the recursion limit
+    long_equation = ' - '.join(5000 * ['x'])
+    assert compile_equation(long_equation)(x=2) == -9996
+    assert compile_equation(' + '.join(1200 * ['x'])).evaluate_columns(np.ones(3)).tolist() \
+        == [1200] * 3
+    for backend_name in ['tree', 'lambda']:
+        try:
+            compile_equation(long_equation, backend_name)(x=2)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'Backend {backend_name!r} evaluated a too deep tree')
+
+    # Test deeply nested parentheses and unary operators
+    nested = '(' * 5000 + '1' + ')' * 5000
+    assert compile_equation(nested)() == evaluate_equation(nested) == 1
+    assert cached_equation(nested).tree == Constant(1)
+    assert compile_equation('-' * 6001 + 'x')(x=2) == -2
+    assert compile_equation('(' * 5000 + 'x + 1' + ')' * 5000)(x=2) == 3
+    for malformed in ['(' * 5000 + '1' + ')' * 4999, '(' * 4999 + '1' + ')' * 5000]:
+        try:
+            evaluate_equation(malformed)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Unbalanced nested equation evaluated')
+
+    # Test constant folding and the equation cache
+    assert compile_equation('3 - 10 * (4 + 8)').tree == Constant(-117)
+    assert compile_equation('x * (4 + 8) - -2').tree == BinaryOperation(
+        '-', BinaryOperation('*', Variable('x'), Constant(12)), Constant(-2))
+    assert isinstance(compile_equation('2 / (1 - 1)').tree, BinaryOperation)
+    try:
+        evaluate_equation('2 / (1 - 1)')
+    except ZeroDivisionError:
+        pass
+    else:
+        raise AssertionError('Division by zero evaluated')
+    assert compile_equation(' + '.join(1000 * ['(3 * 4 - 2)']))() == 10_000
+
+    clear_equation_cache()
+    assert evaluate_equation('8 / 4 * 2') == evaluate_equation(' 8 /  4 * 2 ') == 4.0
+    assert evaluate_equation('2 * -3') == -6
+    assert equation_cache_info() == (1, 2, DEFAULT_EQUATION_CACHE_SIZE, 2)
+    resize_equation_cache(1)
+    evaluate_equation('8 / 4 * 2')
+    evaluate_equation('2 * -3')
+    evaluate_equation('2 * -3')
+    assert equation_cache_info() == (1, 2, 1, 1)
+    resize_equation_cache(DEFAULT_EQUATION_CACHE_SIZE)
+    try:
+        evaluate_equation('1 +      $')
+    except ValueError as error:
+        assert str(error) == "Unexpected character '$' at position 9", error
+    else:
+        raise AssertionError('Malformed equation evaluated')
+    assert equation_cache_info().currsize == 0
+
+    for malformed in ['', '3 +', '(3 + 4', '3 + 4)', '3 4', '3 $ 4', '* 3', '2x', 'x y']:
+        try:
+            compile_equation(malformed)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'Malformed equation compiled: {malformed!r}')
+
+    # Test streaming evaluation of a file of equations
+    with tempfile.TemporaryDirectory() as directory:
+        equations_path = os.path.join(directory, 'equations.txt')
+        results_path = os.path.join(directory, 'results.txt')
+        file_equations = 50 * test_equations + ['3 +', '1 / (2 - 2)', '', '2 $ 3']
+        with open(equations_path, 'w', encoding='utf-8') as input_file:
+            input_file.write('\n'.join(file_equations) + '\n')
+
+        for worker_count in [1, 2]:
+            summary = evaluate_file(equations_path, results_path, chunk_size=16,
+                                    workers=worker_count, max_pending=2)
+            assert summary == FileSummary(len(file_equations), 4)
+            with open(results_path, encoding='utf-8') as output_file:
+                results = output_file.read().splitlines()
+            assert len(results) == len(file_equations)
+            for eq, line_result in zip(file_equations[:-4], results):
+                assert line_result == str(eval(eq)), (eq, line_result)
+            assert results[-4:] == ['ERROR: Unexpected end of equation',
+                                    'ERROR: division by zero',
+                                    'ERROR: Unexpected end of equation',
+                                    "ERROR: Unexpected character '$' at position 2"]
 
     print('All evaluate.py tests pass')
     print(100 * '*')
@@ -0,0 +1,158 @@
+"""Benchmark the evaluators in evaluate against builtin eval
+
+Run as a script to print (or save) a JSON report, for example:
+    python evaluate_benchmark.py --sizes 4 16 64 --evaluations 1000 --output report.json
+"""
+
+import argparse
+import functools
+import json
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+import evaluate
+
+
+# Evaluators of equation strings, timed on every evaluation
+STRING_EVALUATORS: dict[str, Callable[[str], Any]] = {
+    'eval': eval,  # pylint: disable=eval-used
+    'recursive': evaluate._evaluate_equation,  # pylint: disable=protected-access
+    'regex': evaluate._evaluate_equation_regex,  # pylint: disable=protected-access
+    'cached': evaluate.evaluate_equation,
+}
+
+# The regex evaluator rescans the whole equation after every reduction,
+# so its time grows quadratically with the number of operators
+MAX_REGEX_OPERATORS = 256
+
+
+def random_equation(operators: int, rng: random.Random) -> str:
+    """Random equation in the variable x with the given number of operators
+
+    Operators split the equation at random, so parentheses nest about
+    logarithmically deep. Only +, - and * are used so that no
+    subexpression divides by zero.
+    """
+
+    if operators == 0:
+        return rng.choice(['x', str(rng.randint(1, 9))])
+    left_operators = rng.randrange(operators)
+    left = random_equation(left_operators, rng)
+    right = random_equation(operators - 1 - left_operators, rng)
+    if left_operators:
+        left = f'({left})'
+    if operators - 1 - left_operators:
+        right = f'({right})'
+    return f'{left} {rng.choice("+-*")} {right}'
+
+
+def _time_strings(func: Callable[[str], Any], equations: Sequence[str]) -> tuple[list, float]:
+    start = time.perf_counter()
+    results = [func(equation) for equation in equations]
+    return results, time.perf_counter() - start
+
+
+def _time_backend(backend: str, equation: str,
+                  values: Sequence[int]) -> tuple[list, float, float]:
+    start = time.perf_counter()
+    compiled = evaluate.compile_equation(equation, backend)
+    compile_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [compiled.evaluate({'x': value}) for value in values]
+    return results, compile_seconds, time.perf_counter() - start
+
+
+def benchmark(sizes: Sequence[int] = (4, 16, 64),
+              evaluations: int = 1000, *,
+              distinct_values: int = 10,
+              backends: Optional[Sequence[str]] = None,
+              seed: int = 0) -> dict[str, Any]:
+    """Benchmark evaluators and backends and return a JSON-serializable report
+
+    For each size, a random equation with that many operators is evaluated
+    for evaluations values of x drawn from distinct_values integers, so
+    repeated equation strings exercise the evaluate_equation cache.
+    String evaluators get x substituted into the equation; compiled
+    backends are compiled once (timed separately) and given x as a variable.
+    Each result records wall time and whether it agreed with eval.
+    """
+
+    rng = random.Random(seed)
+    report: dict[str, Any] = {
+        'python': sys.version.split()[0],
+        'machine': platform.machine(),
+        'seed': seed,
+        'evaluations': evaluations,
+        'results': [],
+    }
+
+    for size in sizes:
+        equation = random_equation(size, rng)
+        values = [rng.randint(1, distinct_values) for _ in range(evaluations)]
+        equations = [equation.replace('x', str(value)) for value in values]
+        expected = [eval(text) for text in equations]  # pylint: disable=eval-used
+        evaluate.clear_equation_cache()
+
+        records: list[dict[str, Any]] = []
+        for name, func in STRING_EVALUATORS.items():
+            if name == 'regex' and size > MAX_REGEX_OPERATORS:
+                continue
+            record: dict[str, Any] = {'evaluator': name}
+            try:
+                results, seconds = _time_strings(func, equations)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                record['error'] = f'{type(error).__name__}: {error}'
+            else:
+                record.update(seconds=seconds, correct=results == expected)
+            records.append(record)
+
+        for backend in backends or evaluate.EQUATION_BACKENDS:
+            record = {'evaluator': backend}
+            try:
+                results, compile_seconds, seconds = _time_backend(backend, equation, values)
+            except ValueError as error:
+                record['error'] = f'{type(error).__name__}: {error}'
+            else:
+                record.update(compile_seconds=compile_seconds, seconds=seconds,
+                              correct=results == expected)
+            records.append(record)
+
+        for record in records:
+            record['operators'] = size
+            report['results'].append(record)
+
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point"""
+
+    parser = argparse.ArgumentParser(description='Benchmark evaluate')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[4, 16, 64],
+                        help='numbers of operators in the benchmarked equations')
+    parser.add_argument('--evaluations', type=int, default=1000)
+    parser.add_argument('--distinct-values', type=int, default=10,
+                        help='number of distinct values of x, and so of equation strings')
+    parser.add_argument('--backends', nargs='+', choices=list(evaluate.EQUATION_BACKENDS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.sizes, args.evaluations, distinct_values=args.distinct_values,
+                       backends=args.backends, seed=args.seed)
+
+    dump = functools.partial(json.dump, report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            dump(output)
+    else:
+        dump(sys.stdout)
+        print()
+
+
+if __name__ == '__main__':
+    main()
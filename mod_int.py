@@ -0,0 +1,113 @@
+'''Defines a class for integers modulo a fixed modulus'''
+
+from numbers import Integral, Number
+
+
+class ModInt(Number):
+    '''Integer modulo modulus, e.g. an element of the prime field GF(p)
+    ModInt(a, n) is the residue class of a modulo n
+
+    Arithmetic with ints stays modulo n; arithmetic between residues
+    with different moduli raises ValueError. Division multiplies by the
+    modular inverse and raises ZeroDivisionError if there is none.
+    A residue equals only the int in range(n) that represents it, so
+    equality agrees with hashing.
+    '''
+
+    __slots__ = ('value', 'modulus')
+
+    def __init__(self, value, modulus):
+        if not isinstance(modulus, Integral) or modulus < 1:
+            raise ValueError('Modulus must be a positive integer')
+        if isinstance(value, ModInt):
+            value = value.value
+        if not isinstance(value, Integral):
+            raise TypeError('ModInt value must be an integer')
+        self.modulus = int(modulus)
+        self.value = int(value) % self.modulus
+
+    def _other_value(self, other):
+        '''Integer value of the other operand, or None if it is not an integer'''
+        if isinstance(other, ModInt):
+            if other.modulus != self.modulus:
+                raise ValueError('ModInt moduli differ')
+            return other.value
+        if isinstance(other, Integral):
+            return int(other)
+        return None
+
+    def __repr__(self):
+        return f'ModInt({self.value}, {self.modulus})'
+
+    def __str__(self):
+        return str(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def __bool__(self):
+        return self.value != 0
+
+    def __eq__(self, other):
+        if isinstance(other, ModInt):
+            return (self.value, self.modulus) == (other.value, other.modulus)
+        if isinstance(other, Integral):
+            return int(other) == self.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __neg__(self):
+        return ModInt(-self.value, self.modulus)
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return ModInt(self.value + value, self.modulus)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return ModInt(self.value - value, self.modulus)
+
+    def __rsub__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return ModInt(value - self.value, self.modulus)
+
+    def __mul__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return ModInt(self.value * value, self.modulus)
+
+    __rmul__ = __mul__
+
+    def inverse(self):
+        '''Multiplicative inverse'''
+        try:
+            return ModInt(pow(self.value, -1, self.modulus), self.modulus)
+        except ValueError:
+            raise ZeroDivisionError(f'{self!r} is not invertible') from None
+
+    def __truediv__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return self * ModInt(value, self.modulus).inverse()
+
+    def __rtruediv__(self, other):
+        if (value := self._other_value(other)) is None:
+            return NotImplemented
+        return self.inverse() * value
+
+    def __pow__(self, exponent):
+        if not isinstance(exponent, Integral):
+            return NotImplemented
+        if exponent < 0:
+            return self.inverse() ** -exponent
+        return ModInt(pow(self.value, int(exponent), self.modulus), self.modulus)
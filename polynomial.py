@@ -1,36 +1,908 @@
 '''Defines a polynomial function class'''
 
-from numbers import Number
-from itertools import zip_longest
+from numbers import Integral, Number, Rational
+from collections import OrderedDict, namedtuple
+from collections.abc import Iterable, Mapping
+from fractions import Fraction
+from itertools import chain, combinations, zip_longest
+import bisect
+import decimal
+import heapq
+import itertools
+import math
+import random
+import weakref
+import numpy as np
 from instance_class_method import InstanceClassMethod
+from mod_int import ModInt
+
+
+BACKENDS = ('list', 'numpy')
+
+# Integers up to this magnitude are represented exactly by float64
+FLOAT_EXACT_INT = 2 ** 53
+
+# Multiplication algorithm cutoffs, in coefficients of the shorter factor:
+# schoolbook multiplication up to SCHOOLBOOK_MAX_TERMS,
+# FFT convolution of float/complex coefficients from FFT_MIN_TERMS
+SCHOOLBOOK_MAX_TERMS = 32
+FFT_MIN_TERMS = 512
+
+# Kronecker substitution writes every coefficient as a decimal string, so
+# integer coefficients whose product may exceed this many bits (about 3600
+# digits, under the interpreter's default int/str conversion limit) use Karatsuba
+KRONECKER_MAX_BITS = 12_000
+
+# Division uses Newton iteration (power-series inversion of the reversed
+# divisor) once both the divisor and the quotient have this many coefficients
+NEWTON_DIVISION_MIN_TERMS = 64
+
+# Euclid's algorithm on float or complex coefficients treats remainder
+# coefficients up to GCD_TOLERANCE relative to the dividend's largest as zero
+GCD_TOLERANCE = 1e-9
+
+# Miller-Rabin witnesses, the first 13 primes; together they are exact below 3.3 * 10**24
+PRIME_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Aberth iteration stops when no root estimate moves by more than
+# ABERTH_TOLERANCE relative to its magnitude, or after ABERTH_MAX_ITER steps
+ABERTH_TOLERANCE = 1e-14
+ABERTH_MAX_ITER = 500
+
+# Numerical roots whose imaginary part is at most REAL_ROOT_TOLERANCE
+# relative to their magnitude are taken to be real
+REAL_ROOT_TOLERANCE = 1e-9
+
+# Results with at most SPARSE_MAX_DENSITY nonzero coefficients per coefficient,
+# and of order at least SPARSE_MIN_ORDER, are stored as a SparsePolynomial
+SPARSE_MIN_ORDER = 64
+SPARSE_MAX_DENSITY = 0.1
+
+# Polynomial.compile writes integer coefficients below this magnitude as literals
+# and binds larger ones to names, which also avoids the int/str conversion limit
+COMPILE_MAX_INT_LITERAL = 10 ** 100
+
+# Number of products Polynomial.factors remembers by default
+DEFAULT_FACTOR_CACHE_SIZE = 4096
+
+
+def _array_compatible(coeffs):
+    '''Whether coefficients fit a float or complex NumPy array without loss'''
+    for coeff in coeffs:
+        if isinstance(coeff, (float, complex, np.inexact)):
+            continue
+        if isinstance(coeff, Integral) and abs(int(coeff)) <= FLOAT_EXACT_INT:
+            continue
+        return False
+    return True
+
+
+def _to_array(coeffs):
+    '''Contiguous float (or complex) array of coefficients'''
+    arr = np.array(coeffs)
+    if arr.dtype.kind not in 'fc':
+        arr = arr.astype(float)
+    return arr
+
+
+def _trim(coeffs):
+    '''Drop trailing zero coefficients, keeping at least one'''
+    if isinstance(coeffs, np.ndarray):
+        nonzero = np.flatnonzero(coeffs)
+        return coeffs[:nonzero[-1] + 1] if len(nonzero) else coeffs[:1]
+    while coeffs[-1] == 0 and len(coeffs) > 1:
+        coeffs.pop()
+    return coeffs
+
+
+def _schoolbook(coeffs1, coeffs2):
+    '''Product coefficients by the O(n*m) schoolbook method'''
+    prod_coeffs = [0] * (len(coeffs1) + len(coeffs2) - 1)
+    for exponent1, coeff1 in enumerate(coeffs1):
+        for exponent2, coeff2 in enumerate(coeffs2):
+            prod_coeffs[exponent1 + exponent2] += (coeff1 * coeff2)
+    return prod_coeffs
+
+
+def _add_into(target, coeffs, offset, sign=1):
+    '''Add sign * coeffs into target starting at index offset'''
+    for i, coeff in enumerate(coeffs, offset):
+        target[i] += sign * coeff
+
+
+def _karatsuba(coeffs1, coeffs2):
+    '''Product coefficients by Karatsuba's O(n^1.585) method'''
+
+    if len(coeffs1) > len(coeffs2):
+        coeffs1, coeffs2 = coeffs2, coeffs1
+    length1, length2 = len(coeffs1), len(coeffs2)
+
+    if length1 <= SCHOOLBOOK_MAX_TERMS:
+        return _schoolbook(coeffs1, coeffs2)
+
+    prod_coeffs = [0] * (length1 + length2 - 1)
+
+    # Split a much longer factor into blocks the size of the shorter one
+    if 2 * length1 <= length2:
+        for offset in range(0, length2, length1):
+            _add_into(prod_coeffs, _karatsuba(coeffs1, coeffs2[offset:offset + length1]), offset)
+        return prod_coeffs
+
+    half = length2 // 2
+    low1, high1 = coeffs1[:half], coeffs1[half:]
+    low2, high2 = coeffs2[:half], coeffs2[half:]
+
+    low = _karatsuba(low1, low2)
+    high = _karatsuba(high1, high2)
+    middle = _karatsuba([a + b for a, b in zip_longest(low1, high1, fillvalue=0)],
+                        [a + b for a, b in zip_longest(low2, high2, fillvalue=0)])
+    _add_into(middle, low, 0, -1)
+    _add_into(middle, high, 0, -1)
+
+    _add_into(prod_coeffs, low, 0)
+    _add_into(prod_coeffs, middle, half)
+    _add_into(prod_coeffs, high, 2 * half)
+    return prod_coeffs
+
+
+def _kronecker(coeffs1, coeffs2):
+    '''Exact product of integer coefficients by Kronecker substitution
+
+    Both polynomials are evaluated at a power of ten large enough that
+    no product coefficient can overflow its digit slot, the two (huge)
+    integers are multiplied, and the product's digit slots are read back
+    as coefficients. The integers are decimal.Decimal values because
+    libmpdec multiplies huge numbers with a number-theoretic transform,
+    which is far faster than int multiplication at this size.
+    '''
+
+    size = len(coeffs1) + len(coeffs2) - 1
+    bound = max(map(abs, coeffs1)) * max(map(abs, coeffs2)) * min(len(coeffs1), len(coeffs2))
+    digits = len(str(bound)) + 1
+    context = decimal.Context(prec=digits * (size + 2), Emax=decimal.MAX_EMAX)
+
+    def evaluate(coeffs):
+        digit_format = f'0{digits}d'
+        positive = ''.join(format(max(coeff, 0), digit_format) for coeff in reversed(coeffs))
+        negative = ''.join(format(max(-coeff, 0), digit_format) for coeff in reversed(coeffs))
+        return context.subtract(decimal.Decimal(positive), decimal.Decimal(negative))
+
+    product = context.multiply(evaluate(coeffs1), evaluate(coeffs2))
+    text = format(context.abs(product), 'f').rjust(digits * (size + 1), '0')
+
+    # Digit slots hold coefficients in [-half, half), borrowing from the next slot
+    half = 10 ** digits // 2
+    prod_coeffs = []
+    carry = 0
+    end = len(text)
+    for start in range(end - digits, end - digits * (size + 1), -digits):
+        coeff = int(text[start:start + digits]) + carry
+        carry = coeff >= half
+        prod_coeffs.append(coeff - 2 * half * carry)
+
+    if product < 0:
+        return [-coeff for coeff in prod_coeffs]
+    return prod_coeffs
+
+
+def _convolve_arrays(arr1, arr2):
+    '''Product coefficients of float or complex arrays, by FFT for long inputs'''
+    if min(len(arr1), len(arr2)) < FFT_MIN_TERMS:
+        return np.convolve(arr1, arr2)
+    size = len(arr1) + len(arr2) - 1
+    fft_size = 1 << (size - 1).bit_length()
+    if arr1.dtype.kind == 'f' and arr2.dtype.kind == 'f':
+        return np.fft.irfft(np.fft.rfft(arr1, fft_size) * np.fft.rfft(arr2, fft_size),
+                            fft_size)[:size]
+    return np.fft.ifft(np.fft.fft(arr1, fft_size) * np.fft.fft(arr2, fft_size))[:size]
+
+
+def _convolve_lists(coeffs1, coeffs2):
+    '''Product coefficients of coefficient lists, choosing the algorithm by size and type'''
+    if min(len(coeffs1), len(coeffs2)) <= SCHOOLBOOK_MAX_TERMS:
+        return _schoolbook(coeffs1, coeffs2)
+    if isinstance(coeffs1[0], ModInt):
+        modulus = coeffs1[0].modulus
+        if all(isinstance(coeff, ModInt) and coeff.modulus == modulus
+               for coeff in chain(coeffs1, coeffs2)):
+            return [ModInt(coeff, modulus) for coeff in
+                    _convolve_lists(list(map(int, coeffs1)), list(map(int, coeffs2)))]
+    if all(isinstance(coeff, Integral) for coeff in coeffs1) and \
+            all(isinstance(coeff, Integral) for coeff in coeffs2):
+        ints1, ints2 = list(map(int, coeffs1)), list(map(int, coeffs2))
+        bits = max(map(abs, ints1)).bit_length() + max(map(abs, ints2)).bit_length() + \
+            min(len(ints1), len(ints2)).bit_length()
+        if bits <= KRONECKER_MAX_BITS:
+            return _kronecker(ints1, ints2)
+        return _karatsuba(ints1, ints2)
+    if _array_compatible(coeffs1) and _array_compatible(coeffs2):
+        return _convolve_arrays(_to_array(coeffs1), _to_array(coeffs2)).tolist()
+    return _karatsuba(coeffs1, coeffs2)
+
+
+def _divide(num, den):
+    '''Quotient of two coefficients, exact whenever both are exact'''
+    if isinstance(num, Integral) and isinstance(den, Integral):
+        if num % den == 0:
+            return num // den
+        return Fraction(int(num), int(den))
+    if isinstance(num, Rational) and isinstance(den, Rational):
+        return Fraction(num) / Fraction(den)
+    return num / den
+
+
+def _long_division(num, den):
+    '''Quotient and remainder coefficient lists of num / den'''
+    if len(num) < len(den):
+        return [0], list(num)
+    remainder = list(num)
+    quotient = [0] * (len(num) - len(den) + 1)
+    for i in reversed(range(len(quotient))):
+        coeff = _divide(remainder[i + len(den) - 1], den[-1])
+        quotient[i] = coeff
+        if coeff != 0:
+            for j, den_coeff in enumerate(den):
+                remainder[i + j] -= coeff * den_coeff
+    return quotient, remainder[:len(den) - 1] or [0]
+
+
+def _long_division_arrays(num, den):
+    '''Quotient and remainder coefficient arrays of num / den'''
+    if len(num) < len(den):
+        return np.zeros(1, dtype=num.dtype), num.copy()
+    remainder = num.astype(np.result_type(num, den))
+    quotient = np.zeros(len(num) - len(den) + 1, dtype=remainder.dtype)
+    for i in reversed(range(len(quotient))):
+        quotient[i] = remainder[i + len(den) - 1] / den[-1]
+        remainder[i:i + len(den)] -= quotient[i] * den
+    return quotient, remainder[:len(den) - 1] if len(den) > 1 else remainder[:1] * 0
+
+
+def _series_inverse(coeffs, length, convolve):
+    '''First length coefficients of the power series 1 / coeffs by Newton iteration
+    Each step doubles the number of correct coefficients: g <- g - g * (f * g - 1)
+    '''
+    inverse = [_divide(1, coeffs[0])]
+    while len(inverse) < length:
+        precision = min(2 * len(inverse), length)
+        error = convolve(coeffs[:precision], inverse)[len(inverse):precision]
+        correction = convolve(inverse, error)[:precision - len(inverse)]
+        inverse += [-coeff for coeff in correction]
+    return inverse
+
+
+def _newton_division(num, den, convolve):
+    '''Quotient and remainder coefficient lists of num / den in O(M(n)) operations
+
+    Reversing the coefficients turns the quotient into the first
+    len(num) - len(den) + 1 coefficients of the power series
+    reversed(num) / reversed(den), which is found with a series inverse.
+    '''
+    size = len(num) - len(den) + 1
+    inverse = _series_inverse(den[::-1], size, convolve)
+    quotient = convolve(num[::-1][:size], inverse)[:size][::-1]
+    product = convolve(den, quotient)
+    remainder = [coeff - prod_coeff for coeff, prod_coeff in
+                 zip(num[:len(den) - 1], product)]
+    return quotient, remainder or [0]
+
+
+def _convolve_array_lists(coeffs1, coeffs2):
+    '''Product coefficients of float or complex coefficient lists'''
+    return _convolve_arrays(np.asarray(coeffs1), np.asarray(coeffs2)).tolist()
+
+
+def _is_probable_prime(n):
+    '''Miller-Rabin primality test, exact for all n below 3.3 * 10**24'''
+    if n < 2:
+        return False
+    for witness in PRIME_WITNESSES:
+        if n % witness == 0:
+            return n == witness
+    odd, twos = n - 1, 0
+    while odd % 2 == 0:
+        odd //= 2
+        twos += 1
+    for witness in PRIME_WITNESSES:
+        value = pow(witness, odd, n)
+        if value in (1, n - 1):
+            continue
+        for _ in range(twos - 1):
+            value = value * value % n
+            if value == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _next_prime(n):
+    '''Smallest (probable) prime greater than n'''
+    candidate = max(n + 1, 3) | 1
+    while not _is_probable_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+# Arithmetic on coefficient lists over GF(p); the zero polynomial is []
+
+def _gf_trim(coeffs, prime):
+    '''Coefficients reduced modulo prime, without trailing zeros'''
+    coeffs = [coeff % prime for coeff in coeffs]
+    while coeffs and coeffs[-1] == 0:
+        coeffs.pop()
+    return coeffs
+
+
+def _gf_monic(coeffs, prime):
+    '''Coefficients divided by the leading coefficient modulo prime'''
+    inverse = pow(coeffs[-1], -1, prime)
+    return [coeff * inverse % prime for coeff in coeffs]
+
+
+def _gf_sub(coeffs1, coeffs2, prime):
+    '''Difference of two polynomials over GF(prime)'''
+    return _gf_trim([coeff1 - coeff2 for coeff1, coeff2
+                     in zip_longest(coeffs1, coeffs2, fillvalue=0)], prime)
+
+
+def _gf_mul(coeffs1, coeffs2, prime):
+    '''Product of two polynomials over GF(prime)'''
+    if not coeffs1 or not coeffs2:
+        return []
+    return _gf_trim(_convolve_lists(coeffs1, coeffs2), prime)
+
+
+def _gf_divmod(num, den, prime):
+    '''Quotient and remainder of two polynomials over GF(prime)'''
+    if len(num) < len(den):
+        return [], list(num)
+    remainder = list(num)
+    inverse = pow(den[-1], -1, prime)
+    quotient = [0] * (len(num) - len(den) + 1)
+    for i in reversed(range(len(quotient))):
+        coeff = remainder[i + len(den) - 1] * inverse % prime
+        quotient[i] = coeff
+        if coeff:
+            for j, den_coeff in enumerate(den):
+                remainder[i + j] = (remainder[i + j] - coeff * den_coeff) % prime
+    return _gf_trim(quotient, prime), _gf_trim(remainder[:len(den) - 1], prime)
+
+
+def _gf_gcd(coeffs1, coeffs2, prime):
+    '''Monic greatest common divisor over GF(prime) by Euclid's algorithm'''
+    while coeffs2:
+        coeffs1, coeffs2 = coeffs2, _gf_divmod(coeffs1, coeffs2, prime)[1]
+    return _gf_monic(coeffs1, prime) if coeffs1 else coeffs1
+
+
+def _gf_pow_mod(base, exponent, modulus, prime):
+    '''base ** exponent modulo the polynomial modulus over GF(prime)'''
+    result = [1]
+    base = _gf_divmod(base, modulus, prime)[1]
+    while exponent:
+        if exponent & 1:
+            result = _gf_divmod(_gf_mul(result, base, prime), modulus, prime)[1]
+        exponent >>= 1
+        if exponent:
+            base = _gf_divmod(_gf_mul(base, base, prime), modulus, prime)[1]
+    return result
+
+
+def _gf_distinct_degree(coeffs, prime):
+    '''Split a monic square-free polynomial over GF(prime) into
+    (product of all its irreducible factors of degree d, d) pairs'''
+    parts = []
+    power = [0, 1]  # x ** (prime ** degree) modulo coeffs
+    degree = 0
+    while 2 * (degree + 1) < len(coeffs):
+        degree += 1
+        power = _gf_pow_mod(power, prime, coeffs, prime)
+        part = _gf_gcd(coeffs, _gf_sub(power, [0, 1], prime), prime)
+        if len(part) > 1:
+            parts.append((part, degree))
+            coeffs = _gf_divmod(coeffs, part, prime)[0]
+            power = _gf_divmod(power, coeffs, prime)[1]
+    if len(coeffs) > 1:
+        parts.append((coeffs, len(coeffs) - 1))
+    return parts
+
+
+def _gf_equal_degree(coeffs, degree, prime, rng):
+    '''Irreducible factors of a monic polynomial over GF(prime), an odd prime,
+    whose irreducible factors all have the given degree (Cantor-Zassenhaus)'''
+    if len(coeffs) - 1 == degree:
+        return [coeffs]
+    exponent = (prime ** degree - 1) // 2
+    while True:
+        sample = _gf_trim([rng.randrange(prime) for _ in range(len(coeffs) - 1)], prime)
+        if len(sample) < 2:
+            continue
+        split = _gf_gcd(coeffs, _gf_sub(_gf_pow_mod(sample, exponent, coeffs, prime), [1], prime),
+                        prime)
+        if 1 < len(split) < len(coeffs):
+            return _gf_equal_degree(split, degree, prime, rng) + \
+                _gf_equal_degree(_gf_divmod(coeffs, split, prime)[0], degree, prime, rng)
+
+
+# Arithmetic on integer coefficient lists
+
+def _primitive(coeffs):
+    '''Integer coefficients divided by their content, with a positive leading coefficient'''
+    content = math.gcd(*coeffs)
+    if coeffs[-1] < 0:
+        content = -content
+    return [coeff // content for coeff in coeffs]
+
+
+def _exact_quotient(num, den):
+    '''Quotient of integer coefficient lists if den divides num over the integers,
+    otherwise None'''
+    if not any(num):
+        return [0]
+    if len(num) < len(den):
+        return None
+    remainder = list(num)
+    quotient = [0] * (len(num) - len(den) + 1)
+    for i in reversed(range(len(quotient))):
+        coeff, rest = divmod(remainder[i + len(den) - 1], den[-1])
+        if rest:
+            return None
+        quotient[i] = coeff
+        if coeff:
+            for j, den_coeff in enumerate(den):
+                remainder[i + j] -= coeff * den_coeff
+    if any(remainder[:len(den) - 1]):
+        return None
+    return quotient
+
+
+def _pseudo_remainder(num, den):
+    '''Remainder of lead(den) ** (deg(num) - deg(den) + 1) * num / den, over the integers'''
+    remainder = list(num)
+    for i in reversed(range(len(num) - len(den) + 1)):
+        coeff = remainder[i + len(den) - 1]
+        remainder = [rem_coeff * den[-1] for rem_coeff in remainder]
+        for j, den_coeff in enumerate(den):
+            remainder[i + j] -= coeff * den_coeff
+    return _trim(remainder[:len(den) - 1] or [0])
+
+
+def _integer_gcd(coeffs1, coeffs2):
+    '''Primitive greatest common divisor of integer coefficient lists
+    by the subresultant polynomial remainder sequence, in which every
+    pseudo-remainder is divided by a factor known to divide it exactly,
+    keeping the coefficients small without computing any contents'''
+    if len(coeffs1) < len(coeffs2):
+        coeffs1, coeffs2 = coeffs2, coeffs1
+    if not any(coeffs2):
+        return _primitive(coeffs1)
+    coeffs1, coeffs2 = _primitive(coeffs1), _primitive(coeffs2)
+    scale = subresultant = 1
+    while any(coeffs2):
+        delta = len(coeffs1) - len(coeffs2)
+        remainder = _pseudo_remainder(coeffs1, coeffs2)
+        divisor = scale * subresultant ** delta
+        coeffs1, coeffs2 = coeffs2, [coeff // divisor for coeff in remainder]
+        scale = coeffs1[-1]
+        subresultant = scale ** delta // subresultant ** (delta - 1) if delta \
+            else subresultant
+    return _primitive(coeffs1)
+
+
+def _integer_derivative(coeffs):
+    '''Derivative of an integer coefficient list'''
+    return [i * coeff for i, coeff in enumerate(coeffs)][1:] or [0]
+
+
+def _square_free_decomposition(coeffs):
+    '''(factor, multiplicity) pairs of a primitive integer polynomial by Yun's
+    algorithm, whose factors are square-free and pairwise coprime'''
+    derivative = _trim(_integer_derivative(coeffs))
+    common = _integer_gcd(coeffs, derivative)
+    rest = _exact_quotient(coeffs, common)
+    difference = _exact_quotient(derivative, common)
+    parts = []
+    multiplicity = 1
+    while len(rest) > 1:
+        difference = _trim([coeff1 - coeff2 for coeff1, coeff2 in
+                            zip_longest(difference, _integer_derivative(rest), fillvalue=0)])
+        factor = _integer_gcd(rest, difference)
+        if len(factor) > 1:
+            parts.append((factor, multiplicity))
+        rest = _exact_quotient(rest, factor)
+        difference = _exact_quotient(difference, factor)
+        multiplicity += 1
+    return parts
+
+
+def _factor_square_free(coeffs, rng):
+    '''Irreducible factors of a square-free primitive integer polynomial
+
+    The polynomial is factored modulo a prime more than twice as large as
+    any coefficient of (a multiple by the leading coefficient of) one of its
+    factors can be, by Mignotte's bound. Products of subsets of the modular
+    factors, smallest subsets first, are then lifted to symmetric integer
+    representatives and kept if they divide the polynomial.
+    '''
+    degree = len(coeffs) - 1
+    if degree <= 1:
+        return [coeffs]
+    norm = math.isqrt(sum(coeff * coeff for coeff in coeffs)) + 1
+    prime = _next_prime(2 * coeffs[-1] * 2 ** degree * norm)
+    while True:
+        reduced = _gf_trim(coeffs, prime)
+        if len(_gf_gcd(reduced, _gf_trim(_integer_derivative(coeffs), prime), prime)) == 1:
+            break
+        prime = _next_prime(prime)
+    modular = [factor for part, part_degree in _gf_distinct_degree(_gf_monic(reduced, prime), prime)
+               for factor in _gf_equal_degree(part, part_degree, prime, rng)]
+
+    factors = []
+    subset_size = 1
+    while 2 * subset_size <= len(modular):
+        for subset in combinations(range(len(modular)), subset_size):
+            candidate = [coeffs[-1]]
+            for index in subset:
+                candidate = _gf_mul(candidate, modular[index], prime)
+            candidate = _primitive([coeff - prime if coeff > prime // 2 else coeff
+                                    for coeff in candidate])
+            quotient = _exact_quotient(coeffs, candidate)
+            if quotient is not None:
+                factors.append(candidate)
+                coeffs = quotient
+                modular = [factor for i, factor in enumerate(modular) if i not in subset]
+                break
+        else:
+            subset_size += 1
+    factors.append(coeffs)
+    return factors
+
+
+def _factor_rational(coeffs, complete=True):
+    '''Constant and irreducible primitive integer factors (with repetition)
+    of a non-constant polynomial with rational coefficients
+    With complete=False, the square-free decomposition's
+    (factor, multiplicity) pairs instead of irreducible factors'''
+    fractions = [Fraction(coeff) for coeff in coeffs]
+    denominator = math.lcm(*(fraction.denominator for fraction in fractions))
+    integers = [int(fraction * denominator) for fraction in fractions]
+    primitive = _primitive(integers)
+    constant = Fraction(integers[-1], primitive[-1] * denominator)
+    constant = constant.numerator if constant.denominator == 1 else constant
+
+    parts = _square_free_decomposition(primitive)
+    if not complete:
+        return constant, parts
+    rng = random.Random(0)
+    factors = []
+    for part, multiplicity in parts:
+        for factor in _factor_square_free(part, rng):
+            factors.extend([factor] * multiplicity)
+    factors.sort(key=lambda factor: (len(factor), factor))
+    return constant, factors
+
+
+def _aberth(coeffs):
+    '''Roots of a polynomial with a nonzero constant term by Aberth-Ehrlich iteration
+
+    All roots are refined at once: each step moves every estimate by its
+    Newton correction, deflected away from the other estimates.
+    '''
+    degree = len(coeffs) - 1
+    descending = np.asarray(coeffs, dtype=complex)[::-1]
+    derivative = np.polyder(descending)
+    radius = abs(descending[-1] / descending[0]) ** (1 / degree)
+    roots = radius * np.exp(1j * (2 * np.pi * np.arange(degree) / degree + 0.4))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(ABERTH_MAX_ITER):
+            ratio = np.polyval(descending, roots) / np.polyval(derivative, roots)
+            differences = roots[:, None] - roots[None, :]
+            np.fill_diagonal(differences, np.inf)
+            step = ratio / (1 - ratio * (1 / differences).sum(axis=1))
+            step[~np.isfinite(step)] = 0
+            roots -= step
+            if np.all(np.abs(step) <= ABERTH_TOLERANCE * np.maximum(np.abs(roots), 1)):
+                break
+    return roots
+
+
+def _literal(coeff, names, namespace):
+    '''Source for a coefficient: a literal for ints and finite floats that
+    round-trip through repr, otherwise a new name bound in namespace'''
+    # Exact types, because bools and NumPy scalars have other reprs
+    coeff_type = type(coeff)
+    if coeff_type is int and abs(coeff) < COMPILE_MAX_INT_LITERAL \
+            or coeff_type is float and math.isfinite(coeff):
+        return repr(coeff)
+    name = f'c{next(names)}'
+    namespace[name] = coeff
+    return name
+
+
+def _compile_horner(terms):
+    '''Compile a Horner's scheme function of x for (exponent, coeff) terms
+    sorted by exponent; each gap between exponents multiplies by a power of x'''
+    names = itertools.count()
+    namespace = {}
+    lines = ['def polynomial(x):']
+    if not terms:
+        lines.append('    return x * 0')
+    else:
+        previous, coeff = terms[-1]
+        lines.append(f'    result = {_literal(coeff, names, namespace)}')
+        for exponent, coeff in reversed(terms[:-1]):
+            power = 'x' if previous - exponent == 1 else f'x ** {previous - exponent}'
+            lines.append(f'    result = result * {power} + {_literal(coeff, names, namespace)}')
+            previous = exponent
+        if previous:
+            lines.append(f'    return result * {"x" if previous == 1 else f"x ** {previous}"}')
+        else:
+            lines.append('    return result + x * 0' if len(terms) == 1 else '    return result')
+    source = '\n'.join(lines)
+    exec(compile(source, '<polynomial>', 'exec'), namespace)  # pylint: disable=exec-used
+    function = namespace['polynomial']
+    function.source = source
+    return function
+
+
+def _newton_interpolation(xs, ys):
+    '''Coefficients of the interpolating polynomial from Newton's divided differences'''
+    differences = list(ys)
+    for step in range(1, len(xs)):
+        for i in reversed(range(step, len(xs))):
+            differences[i] = _divide(differences[i] - differences[i - 1], xs[i] - xs[i - step])
+    # Nested multiplication: d0 + (x - x0)(d1 + (x - x1)(d2 + ...))
+    coeffs = [differences[-1]]
+    for x_value, difference in zip(reversed(xs[:-1]), reversed(differences[:-1])):
+        coeffs = [difference - x_value * coeffs[0]] + \
+            [coeffs[i - 1] - x_value * coeffs[i] for i in range(1, len(coeffs))] + [coeffs[-1]]
+    return coeffs
+
+
+def _newton_interpolation_arrays(xs, ys):
+    '''_newton_interpolation with each step done on whole arrays'''
+    differences = ys.astype(np.result_type(xs, ys, float))
+    for step in range(1, len(xs)):
+        differences[step:] = (differences[step:] - differences[step - 1:-1]) / \
+            (xs[step:] - xs[:-step])
+    coeffs = differences[-1:]
+    for x_value, difference in zip(xs[-2::-1], differences[-2::-1]):
+        shifted = np.zeros(len(coeffs) + 1, dtype=coeffs.dtype)
+        shifted[1:] = coeffs
+        shifted[:-1] -= x_value * coeffs
+        shifted[0] += difference
+        coeffs = shifted
+    return coeffs
+
+
+def _master_polynomial(xs):
+    '''Coefficients of (x - xs[0]) * (x - xs[1]) * ...'''
+    coeffs = [1]
+    for x_value in xs:
+        coeffs = [-x_value * coeffs[0]] + \
+            [coeffs[i - 1] - x_value * coeffs[i] for i in range(1, len(coeffs))] + [coeffs[-1]]
+    return coeffs
+
+
+def _lagrange_interpolation(xs, ys):
+    '''Coefficients of the interpolating polynomial as the sum of y * w * M / (x - x_j),
+    with M the master polynomial and w the barycentric weights
+    With integer points the weights are scaled to integers by their common
+    denominator, which only divides the final coefficients'''
+    master = _master_polynomial(xs)
+    denominators = []
+    for j, x_j in enumerate(xs):
+        denominator = 1
+        for k, x_k in enumerate(xs):
+            if k != j:
+                denominator *= x_j - x_k
+        denominators.append(denominator)
+    if all(isinstance(value, Integral) for value in chain(xs, ys)):
+        common = math.lcm(*(abs(int(denominator)) for denominator in denominators))
+        scales = [int(y) * (common // int(denominator))
+                  for y, denominator in zip(ys, denominators)]
+    else:
+        common = 1
+        scales = [_divide(y, denominator) for y, denominator in zip(ys, denominators)]
+
+    coeffs = [0] * len(xs)
+    for x_j, scale in zip(xs, scales):
+        # Synthetic division of the master polynomial by (x - x_j)
+        carry = master[-1]
+        for i in reversed(range(len(xs))):
+            coeffs[i] += scale * carry
+            carry = master[i] + x_j * carry
+    return [_divide(coeff, common) for coeff in coeffs]
+
+
+def _lagrange_interpolation_arrays(xs, ys):
+    '''_lagrange_interpolation with all the basis polynomials handled at once'''
+    differences = xs[:, None] - xs[None, :]
+    np.fill_diagonal(differences, 1)
+    scales = ys / differences.prod(axis=1)
+    master = np.poly(xs)[::-1]
+    coeffs = np.zeros(len(xs), dtype=np.result_type(scales, master))
+    carry = np.full(len(xs), master[-1], dtype=np.result_type(xs, master))
+    for i in reversed(range(len(xs))):
+        coeffs[i] = scales @ carry
+        carry = master[i] + xs * carry
+    return coeffs
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class FactorCache:
+    '''Bounded registry mapping product polynomials to the factors they were built from
+    (or powers to their base and exponent)
+
+    Supports the dict operations Polynomial uses (in, [], get, len).
+    Once more than maxsize products are recorded, the least recently
+    used one is evicted; maxsize=None means unbounded and maxsize=0
+    disables recording altogether.
+    With weak=True (the default) an entry is dropped as soon as its
+    product polynomial is garbage-collected.
+    Lookups through get() and [] are counted in cache_info().
+    '''
+
+    def __init__(self, maxsize=DEFAULT_FACTOR_CACHE_SIZE, weak=True):
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self._weak = weak
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, product, callback=None):
+        if not self._weak:
+            return product
+        return weakref.ref(product, callback)
+
+    def _discard(self, key):
+        '''Weak reference callback, drop the entry of a collected product'''
+        self._entries.pop(key, None)
+
+    def __contains__(self, product):
+        return self._key(product) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, product, default=None):
+        '''Factors of product, or default if it is not recorded'''
+        key = self._key(product)
+        if key not in self._entries:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def __getitem__(self, product):
+        factors = self.get(product)
+        if factors is None:
+            raise KeyError(product)
+        return factors
+
+    def __setitem__(self, product, factors):
+        if self._maxsize == 0:
+            return
+        key = self._key(product, self._discard)
+        self._entries[key] = factors
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        if self._maxsize is not None:
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    @property
+    def maxsize(self):
+        '''Maximum number of recorded products, None if unbounded'''
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        self._maxsize = maxsize
+        self._evict()
+
+    def cache_info(self):
+        '''Hit, miss and size statistics, like functools.lru_cache'''
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self):
+        '''Forget all recorded products and reset the statistics'''
+        self._entries.clear()
+        self._hits = self._misses = 0
 
 
 class Polynomial:
     '''Polynomial function class
         The constructor arguments are the polynomial coefficients
         Polynomial(a0, a1, a2, ...) is the same as a0 + a1x + a2x^2 + ...
+
+        backend selects how the coefficients are stored:
+        'list' keeps them in a Python list, which is exact for any number type;
+        'numpy' keeps them in a contiguous float or complex NumPy array,
+        which is much faster for high-order polynomials.
+        Coefficients that an array cannot hold exactly (e.g. Fractions or
+        integers beyond 2**53) always fall back to the list backend.
+        The default is the class attribute default_backend.
+        Arithmetic involving an array-backed polynomial returns
+        an array-backed polynomial where possible.
+
+        The class attribute factors records how products were built, for
+        factorization(). It is a FactorCache and can be resized, replaced
+        or disabled (maxsize=0).
         '''
 
-    factors: dict['Polynomial', tuple['Polynomial', 'Polynomial']] = {}
+    factors = FactorCache()
+    default_backend = 'list'
 
-    def __init__(self, *coeffs):
+    def __init__(self, *coeffs, backend=None):
         if not coeffs:
-            coeffs = [0]
+            coeffs = (0,)
         for coeff in coeffs:
             if not isinstance(coeff, Number):
                 raise TypeError('Polynomial coefficients must be numbers')
-        self._coeffs = list(coeffs)
-        while self._coeffs[-1] == 0 and len(self._coeffs) > 1:
-            self._coeffs.pop()
+        backend = backend or self.default_backend
+        if backend not in BACKENDS:
+            raise ValueError(f'Unknown backend {backend!r}, expected one of {BACKENDS}')
+        if backend == 'numpy' and _array_compatible(coeffs):
+            self._coeffs = _trim(_to_array(coeffs))
+        else:
+            self._coeffs = _trim(list(coeffs))
+
+    @classmethod
+    def _from_coeffs(cls, coeffs):
+        '''Create polynomial from a list or array of coefficients without copying
+        or validating them'''
+        poly = cls.__new__(cls)
+        poly._coeffs = _trim(coeffs)
+        return poly
+
+    @classmethod
+    def from_array(cls, values):
+        '''Create array-backed polynomial from a sequence or NumPy array of coefficients
+        Falls back to the list backend if the values cannot be held exactly'''
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise TypeError('Polynomial coefficients must be one-dimensional')
+        if len(values) == 0:
+            values = np.zeros(1)
+        if values.dtype.kind in 'fc' or \
+                (values.dtype.kind in 'biu' and np.abs(values).max() <= FLOAT_EXACT_INT):
+            return cls._from_coeffs(_to_array(values))
+        return cls(*values.tolist())
 
     @property
     def coeffs(self):
-        '''The polynomial coefficients'''
+        '''The polynomial coefficients, as a list or (with the numpy backend) an array'''
         return self._coeffs
 
+    @property
+    def backend(self):
+        '''The coefficient storage backend, "list" or "numpy"'''
+        return 'numpy' if isinstance(self._coeffs, np.ndarray) else 'list'
+
+    def _coeff_list(self):
+        '''The coefficients as a list of Python numbers'''
+        if isinstance(self._coeffs, np.ndarray):
+            return self._coeffs.tolist()
+        return self._coeffs
+
+    def _as_array(self):
+        '''The coefficients as a NumPy array, or None if that would lose precision'''
+        if isinstance(self._coeffs, np.ndarray):
+            return self._coeffs
+        if _array_compatible(self._coeffs):
+            return _to_array(self._coeffs)
+        return None
+
     def __repr__(self):
         monomials = []
-        for i, coeff in enumerate(self.coeffs):
+        for i, coeff in enumerate(self._coeff_list()):
             if i == 0:
                 monomial = str(coeff)
             elif i == 1:
@@ -45,13 +917,97 @@ class Polynomial:
         if arg_len != 1:
             raise TypeError(f'Polynomial function takes 1 argument but {arg_len} were given')
         arg = args[0]
-        if not isinstance(arg, Number):
-            raise TypeError('Polynomial argument must be a number')
-        result = 0
-        for i, coeff in enumerate(self.coeffs):
-            result += (coeff * arg ** i)
+        if isinstance(arg, Number):
+            # Horner's scheme: a0 + x(a1 + x(a2 + ...))
+            result = 0
+            for coeff in reversed(self._coeff_list()):
+                result = result * arg + coeff
+            return result
+        if isinstance(arg, (str, bytes)) or not isinstance(arg, (np.ndarray, Iterable)):
+            raise TypeError('Polynomial argument must be a number or an array of numbers')
+        return self.evaluate_many(arg)
+
+    def evaluate_many(self, points, method='horner'):
+        '''Evaluate the polynomial at every point of an array or iterable
+        Returns a NumPy array of values with the shape of points.
+        method 'horner' runs Horner's scheme over all points at once;
+        'subproduct' uses subproduct-tree multipoint evaluation, which needs
+        asymptotically fewer operations for high orders and many points but
+        is only numerically stable for exact (integer or rational) inputs
+        '''
+        points = np.asarray(points if isinstance(points, np.ndarray) else list(points))
+        if method == 'horner':
+            return self._horner_many(points)
+        if method == 'subproduct':
+            flat_points = points.ravel().tolist()
+            block = self.order + 1
+            values = []
+            for start in range(0, len(flat_points), block):
+                values.extend(self._subproduct_evaluate(flat_points[start:start + block]))
+            return np.array(values).reshape(points.shape)
+        raise ValueError(f'Unknown evaluation method {method!r}')
+
+    def _horner_many(self, points):
+        '''Vectorized Horner's scheme over an array of points
+        Integer coefficients at integer points are evaluated exactly with
+        Python ints, like the scalar call, instead of in float64
+        '''
+        coeffs = self._as_array()
+        exact = (points.dtype.kind in 'biu' and not isinstance(self._coeffs, np.ndarray)
+                 and all(isinstance(coeff, Integral) for coeff in self._coeffs))
+        if coeffs is None or exact or points.dtype.kind not in 'biufc':
+            coeffs = np.array(self._coeff_list(), dtype=object)
+            if points.dtype.kind in 'biu':
+                points = points.astype(object)
+        result = np.full(points.shape, coeffs[-1], dtype=np.result_type(coeffs, points))
+        for coeff in coeffs[-2::-1]:
+            result *= points
+            result += coeff
         return result
 
+    def _subproduct_evaluate(self, points):
+        '''Values at points (at most order + 1 of them) by a remainder tree'''
+        if not points:
+            return []
+        backend = 'numpy' if self.backend == 'numpy' else 'list'
+        return self._remainder_tree(self._subproduct_tree(points, backend))
+
+    @staticmethod
+    def _subproduct_tree(points, backend='list'):
+        '''Levels of the subproduct tree of points, from the leaves up to the root
+        The leaves are (x - point) and every other node is the product
+        of its (one or two) children
+        '''
+        level = [Polynomial(-point, 1, backend=backend) for point in points]
+        tree = [level]
+        while len(level) > 1:
+            level = [Polynomial._product(*level[i:i + 2]) if i + 1 < len(level) else level[i]
+                     for i in range(0, len(level), 2)]
+            tree.append(level)
+        return tree
+
+    def _remainder_tree(self, tree):
+        '''Values at the points of a subproduct tree: reducing the polynomial
+        modulo each node, from the root down, leaves its value at each point'''
+        remainders = [self._divmod(self, tree[-1][0])[1]]
+        for level in reversed(tree[:-1]):
+            remainders = [self._divmod(remainders[i // 2], node)[1]
+                          for i, node in enumerate(level)]
+        return [remainder[0] for remainder in remainders]
+
+    def compile(self):
+        '''Specialized evaluation function with the coefficients built in
+        Generates and compiles Python source for Horner's scheme with the
+        coefficients as literals (or, if they have none, as bound names),
+        skipping zero coefficients. The function skips all the argument
+        checks of calling the polynomial, so it also evaluates NumPy arrays
+        elementwise. It is cached on the polynomial.
+        '''
+        if (function := getattr(self, '_compiled', None)) is None:
+            # pylint: disable-next=attribute-defined-outside-init
+            function = self._compiled = _compile_horner(self._nonzero_terms())
+        return function
+
     def __getitem__(self, i):
         return self.coeffs[i]
 
@@ -83,27 +1039,153 @@ class Polynomial:
             return self._mul(Polynomial(other), self)
         return NotImplemented
 
+    @classmethod
+    def _array_operands(cls, poly1, poly2):
+        '''Coefficient arrays of both operands if either is array-backed
+        and both can be held as arrays, otherwise None'''
+        if 'numpy' not in (poly1.backend, poly2.backend):
+            return None
+        arr1, arr2 = poly1._as_array(), poly2._as_array()
+        if arr1 is None or arr2 is None:
+            return None
+        return arr1, arr2
+
     @classmethod
     def _add(cls, poly1, poly2):
         '''Sum of two Polynomials'''
+        if (arrays := cls._array_operands(poly1, poly2)) is not None:
+            arr1, arr2 = arrays
+            coeff_sums = np.zeros(max(len(arr1), len(arr2)), dtype=np.result_type(arr1, arr2))
+            coeff_sums[:len(arr1)] += arr1
+            coeff_sums[:len(arr2)] += arr2
+            return Polynomial._from_coeffs(coeff_sums)
         coeff_sums = []
-        for coeff1, coeff2 in zip_longest(poly1, poly2, fillvalue=0):
+        for coeff1, coeff2 in zip_longest(poly1._coeff_list(), poly2._coeff_list(), fillvalue=0):
             coeff_sums.append(coeff1 + coeff2)
         return Polynomial(*coeff_sums)
 
+    @classmethod
+    def _product(cls, poly1, poly2):
+        '''Product of two Polynomials, without recording its factors
+        Uses schoolbook multiplication for short factors, and otherwise
+        Kronecker substitution for integers, (FFT) convolution for floats
+        and complex numbers and Karatsuba multiplication for other exact types
+        '''
+        if (arrays := cls._array_operands(poly1, poly2)) is not None:
+            return Polynomial._from_coeffs(_convolve_arrays(*arrays))
+        return Polynomial(*_convolve_lists(poly1._coeff_list(), poly2._coeff_list()))
+
     @classmethod
     def _mul(cls, poly1, poly2):
         '''Product of two Polynomials'''
-        prod_coeffs = [0] * (poly1.order + poly2.order + 1)
-        for exponent1, coeff1 in enumerate(poly1.coeffs):
-            for exponent2, coeff2 in enumerate(poly2.coeffs):
-                prod_coeffs[exponent1 + exponent2] += (coeff1 * coeff2)
-        product = Polynomial(*prod_coeffs)
+        product = cls._product(poly1, poly2)
         if product not in cls.factors:
             cls.factors[product] = (poly1, poly2)
         return product
 
+    @classmethod
+    def _divmod(cls, poly1, poly2):
+        '''Quotient and remainder of two Polynomials
+        Uses long division, or Newton iteration once both the divisor and
+        the quotient have at least NEWTON_DIVISION_MIN_TERMS coefficients,
+        unless all coefficients are integers or rationals (whose series
+        inverses have huge numerators and denominators)
+        '''
+        if poly2 == 0:
+            raise ZeroDivisionError('Polynomial division by zero')
+        newton = min(poly2.order, poly1.order - poly2.order) + 1 >= NEWTON_DIVISION_MIN_TERMS
+        if (arrays := cls._array_operands(poly1, poly2)) is not None:
+            if newton:
+                quotient, remainder = _newton_division(*(arr.tolist() for arr in arrays),
+                                                       _convolve_array_lists)
+                return Polynomial.from_array(quotient), Polynomial.from_array(remainder)
+            quotient, remainder = _long_division_arrays(*arrays)
+            return Polynomial._from_coeffs(quotient), Polynomial._from_coeffs(remainder)
+        if newton and not all(isinstance(coeff, Rational) for coeff in
+                              chain(poly1._coeff_list(), poly2._coeff_list())):
+            quotient, remainder = _newton_division(poly1._coeff_list(), poly2._coeff_list(),
+                                                   _convolve_lists)
+        else:
+            quotient, remainder = _long_division(poly1._coeff_list(), poly2._coeff_list())
+        return Polynomial(*quotient), Polynomial(*remainder)
+
+    def __divmod__(self, other):
+        if isinstance(other, Number):
+            other = Polynomial(other)
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        return self._divmod(self, other)
+
+    def __rdivmod__(self, other):
+        if not isinstance(other, Number):
+            return NotImplemented
+        return self._divmod(Polynomial(other), self)
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __rfloordiv__(self, other):
+        result = self.__rdivmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __rmod__(self, other):
+        result = self.__rdivmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def gcd(self, other):
+        '''Greatest common divisor of two polynomials
+        For integer coefficients it is computed with the subresultant remainder
+        sequence and is the primitive gcd times the gcd of the contents;
+        otherwise with Euclid's algorithm, and it is monic. For float or
+        complex coefficients, remainder coefficients that are tiny relative
+        to the dividend (see GCD_TOLERANCE) are taken to be zero
+        '''
+        if isinstance(other, Number):
+            other = Polynomial(other)
+        if not isinstance(other, Polynomial):
+            raise TypeError('gcd requires a polynomial or number')
+        coeffs1, coeffs2 = self._coeff_list(), other._coeff_list()
+        if all(isinstance(coeff, Integral) for coeff in chain(coeffs1, coeffs2)):
+            if not any(coeffs1) or not any(coeffs2):
+                common = coeffs1 if any(coeffs1) else coeffs2
+                return Polynomial(*(common if common[-1] >= 0 else [-c for c in common]))
+            content = math.gcd(math.gcd(*map(int, coeffs1)), math.gcd(*map(int, coeffs2)))
+            return Polynomial(*(content * coeff for coeff in
+                                _integer_gcd(list(map(int, coeffs1)), list(map(int, coeffs2)))))
+
+        inexact = not all(isinstance(coeff, (Rational, ModInt))
+                          for coeff in chain(coeffs1, coeffs2))
+        poly1, poly2 = self, other
+        while poly2 != 0:
+            remainder = self._divmod(poly1, poly2)[1]
+            if inexact:
+                tolerance = GCD_TOLERANCE * max(abs(coeff) for coeff in poly1._coeff_list())
+                remainder_coeffs = remainder._coeff_list()
+                remainder = Polynomial(*(0 if abs(coeff) <= tolerance else coeff
+                                         for coeff in remainder_coeffs))
+            poly1, poly2 = poly2, remainder
+        if poly1 == 0:
+            return poly1
+        return self._divmod(poly1, Polynomial(poly1._coeff_list()[-1]))[0]
+
+    @classmethod
+    def gf(cls, prime, *coeffs):
+        '''Create polynomial with coefficients in the prime field GF(prime)
+        The coefficients are ModInt residues, so all arithmetic, division
+        and gcd happen modulo prime
+        '''
+        if not isinstance(prime, Integral) or not _is_probable_prime(prime):
+            raise ValueError(f'{prime!r} is not a prime')
+        return cls(*(ModInt(coeff, prime) for coeff in coeffs or (0,)))
+
     def __neg__(self):
+        if isinstance(self._coeffs, np.ndarray):
+            return Polynomial._from_coeffs(-self._coeffs)
         neg_coeffs = [-coeff for coeff in self.coeffs]
         return Polynomial(*neg_coeffs)
 
@@ -113,12 +1195,77 @@ class Polynomial:
     def __rsub__(self, other):
         return other + -self
 
-    def __pow__(self, other):
+    def __pow__(self, other, modulo=None):
+        '''self ** other, or self ** other % modulo for pow(self, other, modulo)
+        Uses exponentiation by squaring, so only O(log other) products are
+        computed (and recorded in factors); monomials and binomials are
+        expanded directly with binomial coefficients instead, and recorded
+        in factors as (base, exponent) unless either is sparse
+        '''
         if not isinstance(other, int):
             raise TypeError('Exponent must be integer')
-        result = Polynomial(1)
-        for _ in range(other):
-            result *= self
+        if other < 0:
+            raise ValueError('Exponent must be non-negative')
+        if modulo is not None:
+            if isinstance(modulo, Number):
+                modulo = Polynomial(modulo)
+            if not isinstance(modulo, Polynomial):
+                return NotImplemented
+            return self._pow_mod(other, modulo)
+        if other == 0:
+            return Polynomial(1)
+
+        terms = self._nonzero_terms()
+        if 1 <= len(terms) <= 2 and other > 1:
+            power = self._binomial_power(terms, other)
+            sparse = isinstance(self, SparsePolynomial) or isinstance(power, SparsePolynomial)
+            if not sparse and power not in self.factors:
+                self.factors[power] = (self, other)
+            return power
+
+        result = None
+        base = self
+        while True:
+            if other & 1:
+                result = base if result is None else result * base
+            other >>= 1
+            if not other:
+                return result
+            base = base * base
+
+    def _binomial_power(self, terms, exponent):
+        '''(a*x^i + b*x^j) ** exponent by the binomial theorem'''
+        (low_exponent, low_coeff), (high_exponent, high_coeff) = terms[0], terms[-1]
+        if len(terms) == 1:
+            power_terms = [(low_exponent * exponent, low_coeff ** exponent)]
+        else:
+            low_powers = [1]
+            for _ in range(exponent):
+                low_powers.append(low_powers[-1] * low_coeff)
+            power_terms = []
+            binomial, high_power = 1, 1
+            for k in range(exponent + 1):
+                power_terms.append((low_exponent * (exponent - k) + high_exponent * k,
+                                    binomial * low_powers[exponent - k] * high_power))
+                binomial = binomial * (exponent - k) // (k + 1)
+                high_power *= high_coeff
+        if self.backend == 'numpy':
+            power_coeffs = [0] * (power_terms[-1][0] + 1)
+            for power_exponent, coeff in power_terms:
+                power_coeffs[power_exponent] = coeff
+            return Polynomial.from_array(power_coeffs)
+        return Polynomial._from_terms(power_terms)
+
+    def _pow_mod(self, exponent, modulo):
+        '''self ** exponent % modulo by square-and-multiply, reducing every product'''
+        result = self._divmod(Polynomial(1), modulo)[1]
+        base = self._divmod(self, modulo)[1]
+        while exponent:
+            if exponent & 1:
+                result = self._divmod(self._product(result, base), modulo)[1]
+            exponent >>= 1
+            if exponent:
+                base = self._divmod(self._product(base, base), modulo)[1]
         return result
 
     def __pos__(self):
@@ -126,7 +1273,9 @@ class Polynomial:
 
     def __eq__(self, other):
         if isinstance(other, Polynomial):
-            return self.coeffs == other.coeffs
+            if self.backend == 'list' and other.backend == 'list':
+                return self.coeffs == other.coeffs
+            return self._coeff_list() == other._coeff_list()
         if isinstance(other, Number):
             return self.order == 0 and self.coeffs[0] == other
         return False
@@ -135,7 +1284,7 @@ class Polynomial:
         return not self == other
 
     def __hash__(self):
-        return hash(tuple(self.coeffs))
+        return hash(tuple(self._coeff_list()))
 
     @property
     def order(self):
@@ -144,16 +1293,142 @@ class Polynomial:
 
     @classmethod
     def from_map(cls, mapping):
-        '''Create polynomial from dict or other mapping'''
-        order = max(mapping.keys())
+        '''Create polynomial from dict or other mapping
+        Returns a SparsePolynomial if few of the coefficients are nonzero'''
+        return cls._from_terms(sorted((int(key), float(value)) for key, value in mapping.items()))
+
+    @classmethod
+    def interpolate(cls, xs, ys, method='newton'):
+        '''Create the polynomial of least order through the points (xs[i], ys[i])
+        The x values must be distinct. method selects the algorithm:
+        'newton' expands Newton's divided differences form, 'lagrange' sums
+        the barycentric Lagrange basis polynomials, both in O(n^2) operations,
+        and 'fast' combines the basis up a subproduct tree, so its work is in
+        a few large products and divisions (O(n log^2 n) operations where
+        division is fast too, i.e. for GF(p) or float points; with floats it
+        loses accuracy quickly as n grows). Integer, rational or GF(p)
+        points give exact coefficients; otherwise the work is done on NumPy
+        arrays.
+        '''
+        xs, ys = list(xs), list(ys)
+        if len(xs) != len(ys):
+            raise ValueError('Interpolation needs as many x values as y values')
+        if not xs:
+            raise ValueError('Interpolation needs at least one point')
+        for value in chain(xs, ys):
+            if not isinstance(value, Number):
+                raise TypeError('Interpolation points must be numbers')
+        if len(set(xs)) != len(xs):
+            raise ValueError('Interpolation x values must be distinct')
+
+        exact = all(isinstance(value, (Rational, ModInt)) for value in chain(xs, ys))
+        if method == 'fast':
+            coeffs = cls._fast_interpolation(xs, ys)
+            return Polynomial(*coeffs) if exact else cls.from_array(coeffs)
+        if method == 'newton':
+            coeffs = _newton_interpolation(xs, ys) if exact else \
+                _newton_interpolation_arrays(np.array(xs), np.array(ys))
+        elif method == 'lagrange':
+            coeffs = _lagrange_interpolation(xs, ys) if exact else \
+                _lagrange_interpolation_arrays(np.array(xs), np.array(ys))
+        else:
+            raise ValueError(f'Unknown interpolation method {method!r}')
+        return Polynomial(*coeffs) if exact else cls.from_array(coeffs)
+
+    @classmethod
+    def _fast_interpolation(cls, xs, ys):
+        '''Coefficients of the interpolating polynomial sum(c_i * M / (x - x_i)),
+        with M the root of the subproduct tree and c_i = y_i / M'(x_i),
+        found by combining the sums up the tree: each node is
+        left sum * right node + right sum * left node
+
+        With integer points the c_i are scaled to integers by their common
+        denominator, which only divides the final coefficients.
+        '''
+        tree = cls._subproduct_tree(xs)
+        derivatives = tree[-1][0].derivative._remainder_tree(tree)
+        if all(isinstance(value, Integral) for value in chain(xs, ys)):
+            common = math.lcm(*(abs(int(derivative)) for derivative in derivatives))
+            values = [Polynomial(int(y) * (common // int(derivative)))
+                      for y, derivative in zip(ys, derivatives)]
+        else:
+            common = 1
+            values = [Polynomial(_divide(y, derivative)) for y, derivative in zip(ys, derivatives)]
+        for level in tree[:-1]:
+            values = [Polynomial._add(Polynomial._product(values[i], level[i + 1]),
+                                      Polynomial._product(values[i + 1], level[i]))
+                      if i + 1 < len(level) else values[i]
+                      for i in range(0, len(level), 2)]
+        return [_divide(coeff, common) for coeff in values[0]._coeff_list()]
+
+    @classmethod
+    def fit(cls, xs, ys, degree, weights=None):
+        '''Least-squares fit of a polynomial of the given degree to points
+        ys may be two-dimensional with one column per curve, to fit many
+        curves at once; xs is then either shared by all the curves or has
+        the shape of ys. weights optionally weights the residuals (with
+        the shape of xs). Returns a Polynomial, or a list of them with
+        one per column of ys.
+        '''
+        if not isinstance(degree, Integral) or degree < 0:
+            raise ValueError('Fit degree must be a non-negative integer')
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys)
+        if ys.ndim not in (1, 2) or xs.shape not in (ys.shape[:1], ys.shape):
+            raise ValueError('xs must have the shape of ys or of its first axis')
+        if weights is not None:
+            weights = np.broadcast_to(np.asarray(weights, dtype=float), xs.shape)
+        powers = np.arange(degree + 1)
+
+        if xs.ndim == 1:
+            vandermonde = xs[:, None] ** powers
+            if weights is not None:
+                vandermonde = vandermonde * weights[:, None]
+                ys = ys * (weights[:, None] if ys.ndim == 2 else weights)
+            # Scaling the columns to unit norm improves the conditioning
+            scale = np.linalg.norm(vandermonde, axis=0)
+            scale[scale == 0] = 1
+            coeffs = np.linalg.lstsq(vandermonde / scale, ys, rcond=None)[0]
+            coeffs = coeffs / (scale[:, None] if ys.ndim == 2 else scale)
+        else:
+            # One Vandermonde matrix per curve, solved in a single batch
+            vandermonde = xs.T[:, :, None] ** powers
+            curve_ys = ys.T
+            if weights is not None:
+                vandermonde = vandermonde * weights.T[:, :, None]
+                curve_ys = curve_ys * weights.T
+            scale = np.linalg.norm(vandermonde, axis=1, keepdims=True)
+            scale[scale == 0] = 1
+            coeffs = (np.linalg.pinv(vandermonde / scale) @ curve_ys[:, :, None])[:, :, 0]
+            coeffs = (coeffs / scale[:, 0, :]).T
+
+        if coeffs.ndim == 1:
+            return cls.from_array(coeffs)
+        return [cls.from_array(column) for column in coeffs.T]
+
+    @classmethod
+    def _from_terms(cls, terms):
+        '''Create polynomial from (exponent, coeff) pairs sorted by exponent,
+        as a SparsePolynomial if few of the coefficients are nonzero'''
+        terms = [(exponent, coeff) for exponent, coeff in terms if coeff != 0]
+        order = terms[-1][0] if terms else 0
+        if order >= SPARSE_MIN_ORDER and len(terms) <= SPARSE_MAX_DENSITY * (order + 1):
+            return SparsePolynomial._from_sorted(terms)
         coeffs = [0] * (order + 1)
-        for key, value in mapping.items():
-            coeffs[int(key)] = float(value)
-        return cls(*coeffs)
+        for exponent, coeff in terms:
+            coeffs[exponent] = coeff
+        return Polynomial(*coeffs)
+
+    def _nonzero_terms(self):
+        '''(exponent, coeff) pairs of the nonzero coefficients, by increasing exponent'''
+        return [(exponent, coeff) for exponent, coeff in enumerate(self._coeff_list())
+                if coeff != 0]
 
     @property
     def derivative(self):
         '''f'(x)'''
+        if isinstance(self._coeffs, np.ndarray):
+            return Polynomial._from_coeffs(self._coeffs[1:] * np.arange(1, len(self._coeffs))
+                                           if len(self._coeffs) > 1 else self._coeffs * 0)
         deriv_coeffs = []
         for i, coeff in enumerate(self.coeffs):
             if i > 0:
@@ -169,14 +1444,337 @@ class Polynomial:
     def __int__(self):
         return int(self.coeffs[0])
 
+    def roots(self, method='eig'):
+        '''Complex roots of the polynomial, with multiplicity, as a NumPy array
+        method 'eig' computes them as the eigenvalues of the companion matrix;
+        'aberth' refines all of them at once by Aberth-Ehrlich iteration,
+        which is cheaper for high orders
+        '''
+        coeffs = np.array(self._coeff_list(), dtype=complex)
+        zeros = int(np.flatnonzero(coeffs)[0]) if coeffs.any() else 0
+        coeffs = coeffs[zeros:]
+        if method == 'eig':
+            nonzero_roots = np.linalg.eigvals(np.polynomial.polynomial.polycompanion(coeffs)) \
+                if len(coeffs) > 2 else -coeffs[:1] / coeffs[1:]
+        elif method == 'aberth':
+            nonzero_roots = _aberth(coeffs) if len(coeffs) > 1 else coeffs[:0]
+        else:
+            raise ValueError(f'Unknown root-finding method {method!r}')
+        return np.concatenate((np.zeros(zeros, dtype=complex), nonzero_roots))
+
+    def square_free_decomposition(self):
+        '''Square-free decomposition of a polynomial with integer or rational coefficients
+        Returns a list of (factor, multiplicity) pairs of pairwise coprime,
+        square-free primitive integer polynomials, preceded by (constant, 1)
+        unless the constant factor is 1
+        '''
+        coeffs = self._exact_coeffs()
+        if self.order < 1:
+            return [(self, 1)]
+        constant, primitive = _factor_rational(coeffs, complete=False)
+        parts = [(Polynomial(*factor), multiplicity) for factor, multiplicity in primitive]
+        if constant != 1:
+            parts.insert(0, (Polynomial(constant), 1))
+        return parts
+
+    def _exact_coeffs(self):
+        '''The coefficients, if they are all integers or rationals'''
+        coeffs = self._coeff_list()
+        if not all(isinstance(coeff, Rational) for coeff in coeffs):
+            raise TypeError('Exact factorization requires integer or rational coefficients')
+        return coeffs
+
+    def _numeric_factors(self):
+        '''Linear and irreducible real quadratic factors from the roots'''
+        roots = self.roots()
+        if any(isinstance(coeff, (complex, np.complexfloating)) and coeff.imag
+               for coeff in self._coeff_list()):
+            return [Polynomial(-complex(root), 1)
+                    for root in sorted(roots.tolist(), key=lambda root: (root.real, root.imag))]
+
+        is_real = np.abs(roots.imag) <= REAL_ROOT_TOLERANCE * np.maximum(np.abs(roots), 1)
+        complex_roots = sorted(roots[~is_real].tolist(), key=lambda root: -root.imag)
+        real_roots = roots[is_real].real.tolist()
+        if len(complex_roots) % 2:
+            real_roots.append(min(complex_roots, key=lambda root: abs(root.imag)).real)
+            complex_roots.remove(min(complex_roots, key=lambda root: abs(root.imag)))
+        factors = [Polynomial(-root, 1.) for root in sorted(real_roots)]
+        factors += [Polynomial(abs(root) ** 2, -2 * root.real, 1.) for root in
+                    sorted(complex_roots[:len(complex_roots) // 2], key=lambda root: root.real)]
+        return factors
+
     @InstanceClassMethod
-    def factorization(self, cls):
+    def factorization(self, cls, method=None):
         '''Factor the polynomial
         Returns a list of polynomial factors
+
+        By default the factors are those recorded in cls.factors when the
+        polynomial was built by multiplication; a polynomial that was not
+        built that way is its only factor. method factors it completely:
+        'exact' into irreducible factors over the rationals (the coefficients
+        must be integers or rationals), 'numeric' into real linear and
+        quadratic factors (complex linear factors if a coefficient is complex)
+        found from the roots, and 'auto' picks 'exact' whenever it can.
+        Complete factorizations start with the constant factor unless it is 1.
+        '''
+        if method is None:
+            factor1, factor2 = cls.factors.get(self, (self, None))
+            if factor2 is None or factor1 == 1 or factor2 == 1:
+                return [self]
+            if isinstance(factor2, int):
+                # A power recorded as (base, exponent)
+                return factor1.factorization() * factor2
+            return factor1.factorization() + factor2.factorization()
+
+        if method == 'auto':
+            exact = all(isinstance(coeff, Rational) for coeff in self._coeff_list())
+            method = 'exact' if exact else 'numeric'
+        if method == 'exact':
+            coeffs = self._exact_coeffs()
+            if self.order < 1:
+                return [self]
+            constant, factors = _factor_rational(coeffs)
+            factors = [Polynomial._from_terms(enumerate(factor)) for factor in factors]
+        elif method == 'numeric':
+            if self.order < 1:
+                return [self]
+            constant = self._coeff_list()[-1]
+            factors = self._numeric_factors()
+        else:
+            raise ValueError(f'Unknown factorization method {method!r}')
+        if constant != 1:
+            factors.insert(0, Polynomial(constant))
+        return factors
+
+
+class SparsePolynomial(Polynomial):
+    '''Polynomial stored as its nonzero terms
+        SparsePolynomial({exponent: coeff, ...}), or an iterable of
+        (exponent, coeff) pairs, is the sum of the terms coeff * x^exponent,
+        so x^1000000 + 1 is SparsePolynomial({0: 1, 1000000: 1}).
+
+        The terms are kept sorted by exponent. Addition merges the terms of
+        both operands and multiplication merges the products of terms through
+        a heap, so both take time in the number of terms, not the order.
+        Results, including those of arithmetic between sparse and dense
+        polynomials, are sparse or dense depending on their density (see
+        SPARSE_MIN_ORDER and SPARSE_MAX_DENSITY). Operations without a sparse
+        implementation work on the dense coefficients and return dense results.
+
+        Sparse products are not recorded in factors, because hashing a
+        polynomial (which must agree with the dense hash) takes time
+        proportional to its order.
+        '''
+
+    def __init__(self, terms=()):  # pylint: disable=super-init-not-called
+        if isinstance(terms, Mapping):
+            terms = terms.items()
+        merged = {}
+        for exponent, coeff in terms:
+            if not isinstance(exponent, Integral) or exponent < 0:
+                raise ValueError('Polynomial exponents must be non-negative integers')
+            if not isinstance(coeff, Number):
+                raise TypeError('Polynomial coefficients must be numbers')
+            merged[int(exponent)] = merged.get(int(exponent), 0) + coeff
+        self._terms = [(exponent, coeff) for exponent, coeff in sorted(merged.items())
+                       if coeff != 0]
+        self._hash = None
+
+    @classmethod
+    def _from_sorted(cls, terms):
+        '''Create sparse polynomial from nonzero (exponent, coeff) pairs sorted
+        by exponent, without copying or validating them'''
+        poly = cls.__new__(cls)
+        poly._terms = terms
+        poly._hash = None
+        return poly
+
+    @classmethod
+    def _from_coeffs(cls, coeffs):
+        if isinstance(coeffs, np.ndarray):
+            coeffs = coeffs.tolist()
+        return cls._from_sorted([(exponent, coeff) for exponent, coeff in enumerate(coeffs)
+                                 if coeff != 0])
+
+    @classmethod
+    def from_array(cls, values):
+        '''Create sparse polynomial from a sequence or NumPy array of coefficients'''
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise TypeError('Polynomial coefficients must be one-dimensional')
+        return cls._from_coeffs(values)
+
+    @property
+    def _coeffs(self):
+        '''Dense coefficient list, for the operations without a sparse implementation'''
+        coeffs = [0] * (self.order + 1)
+        for exponent, coeff in self._terms:
+            coeffs[exponent] = coeff
+        return coeffs
+
+    @property
+    def terms(self):
+        '''The nonzero terms as a dict from exponent to coefficient'''
+        return dict(self._terms)
+
+    @property
+    def backend(self):
+        '''The coefficient storage backend, "sparse"'''
+        return 'sparse'
+
+    def _nonzero_terms(self):
+        return self._terms
+
+    @property
+    def order(self):
+        return self._terms[-1][0] if self._terms else 0
+
+    def __repr__(self):
+        monomials = []
+        for exponent, coeff in self._terms:
+            if exponent == 0:
+                monomial = str(coeff)
+            elif exponent == 1:
+                monomial = f'{coeff}x'
+            else:
+                monomial = f'{coeff}x^{exponent}'
+            monomials.append(monomial)
+        return ' + '.join(monomials) or '0'
+
+    def _evaluate(self, arg):
+        '''Horner's scheme skipping the zero coefficients: multiplies by a power
+        of arg for each gap between consecutive exponents'''
+        result = 0
+        previous = self.order
+        for exponent, coeff in reversed(self._terms):
+            result = result * arg ** (previous - exponent) + coeff
+            previous = exponent
+        return result * arg ** previous
+
+    def __call__(self, *args, **kwargs):
+        if len(args) == 1 and isinstance(args[0], Number):
+            return self._evaluate(args[0])
+        return super().__call__(*args, **kwargs)
+
+    def _horner_many(self, points):
+        coeffs = [coeff for _, coeff in self._terms]
+        exact = (points.dtype.kind in 'biu'
+                 and all(isinstance(coeff, Integral) for coeff in coeffs))
+        if exact or not _array_compatible(coeffs) or points.dtype.kind not in 'biufc':
+            points = points.astype(object)
+        elif points.dtype.kind in 'biu':
+            points = points.astype(float)
+        return np.zeros(points.shape, dtype=points.dtype) + self._evaluate(points)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.coeffs[i]
+        order = self.order
+        index = i + order + 1 if i < 0 else i
+        if not 0 <= index <= order:
+            raise IndexError('Polynomial coefficient index out of range')
+        position = bisect.bisect_left(self._terms, (index,))
+        if position < len(self._terms) and self._terms[position][0] == index:
+            return self._terms[position][1]
+        return 0
+
+    # Python only tries a subclass's reflected operator before the left operand's
+    # operator if the subclass redefines it, so dense + sparse runs sparse code
+    def __radd__(self, other):  # pylint: disable=useless-parent-delegation
+        return super().__radd__(other)
+
+    def __rmul__(self, other):  # pylint: disable=useless-parent-delegation
+        return super().__rmul__(other)
+
+    def __rsub__(self, other):  # pylint: disable=useless-parent-delegation
+        return super().__rsub__(other)
+
+    @classmethod
+    def _add(cls, poly1, poly2):
+        '''Sum of two Polynomials by merging their sorted terms'''
+        terms1, terms2 = poly1._nonzero_terms(), poly2._nonzero_terms()
+        sum_terms = []
+        i = j = 0
+        while i < len(terms1) and j < len(terms2):
+            (exponent1, coeff1), (exponent2, coeff2) = terms1[i], terms2[j]
+            if exponent1 < exponent2:
+                sum_terms.append(terms1[i])
+                i += 1
+            elif exponent2 < exponent1:
+                sum_terms.append(terms2[j])
+                j += 1
+            else:
+                sum_terms.append((exponent1, coeff1 + coeff2))
+                i += 1
+                j += 1
+        sum_terms.extend(terms1[i:])
+        sum_terms.extend(terms2[j:])
+        return Polynomial._from_terms(sum_terms)
+
+    @classmethod
+    def _product(cls, poly1, poly2):
+        '''Product of two Polynomials by heap-merging the products of their terms
+
+        The heap holds the next unmerged product of each term of the operand
+        with fewer terms, so products come out sorted by exponent and equal
+        exponents are summed as they appear. If there are more products of
+        terms than coefficients in the result, the dense product is faster.
         '''
-        if self not in cls.factors:
-            return [self]
-        factor1, factor2 = cls.factors[self]
-        if factor1 == 1 or factor2 == 1:
-            return [self]
-        return factor1.factorization() + factor2.factorization()
+        terms1, terms2 = poly1._nonzero_terms(), poly2._nonzero_terms()
+        if not terms1 or not terms2:
+            return Polynomial(0)
+        if len(terms1) * len(terms2) > terms1[-1][0] + terms2[-1][0] + 1:
+            return Polynomial._from_terms(Polynomial._product(poly1, poly2)._nonzero_terms())
+        if len(terms1) > len(terms2):
+            terms1, terms2 = terms2, terms1
+
+        heap = [(exponent + terms2[0][0], i, 0) for i, (exponent, _) in enumerate(terms1)]
+        prod_terms = []
+        while heap:
+            exponent, i, j = heap[0]
+            coeff = terms1[i][1] * terms2[j][1]
+            if j + 1 < len(terms2):
+                heapq.heapreplace(heap, (terms1[i][0] + terms2[j + 1][0], i, j + 1))
+            else:
+                heapq.heappop(heap)
+            if prod_terms and prod_terms[-1][0] == exponent:
+                prod_terms[-1] = (exponent, prod_terms[-1][1] + coeff)
+            else:
+                prod_terms.append((exponent, coeff))
+        return Polynomial._from_terms(prod_terms)
+
+    @classmethod
+    def _mul(cls, poly1, poly2):
+        '''Product of two Polynomials, not recorded in factors'''
+        return cls._product(poly1, poly2)
+
+    def __neg__(self):
+        return SparsePolynomial._from_sorted([(exponent, -coeff)
+                                              for exponent, coeff in self._terms])
+
+    def __eq__(self, other):
+        if isinstance(other, Polynomial):
+            return self._terms == other._nonzero_terms()
+        if isinstance(other, Number):
+            return self.order == 0 and self[0] == other
+        return False
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = super().__hash__()
+        return self._hash
+
+    @property
+    def derivative(self):
+        '''f'(x)'''
+        return Polynomial._from_terms([(exponent - 1, exponent * coeff)
+                                       for exponent, coeff in self._terms if exponent > 0])
+
+    def __complex__(self):
+        return complex(self[0])
+
+    def __float__(self):
+        return float(self[0])
+
+    def __int__(self):
+        return int(self[0])
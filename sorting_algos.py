@@ -1,9 +1,51 @@
 """This module implements well-known sorting algorithms in Python"""
 
+import array
+import bisect
+import contextlib
+import heapq
+import itertools
 import operator
 import functools
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from collections.abc import Callable, Iterable, Sequence
+from typing import IO, Any, Optional, TypeVar
 
-PairList = list[tuple[int, str]]
+import numpy as np
+
+T = TypeVar('T')
+
+# Inputs shorter than this are sorted in a single process
+PARALLEL_THRESHOLD = 100_000
+
+# sample_sort draws this many sample elements per bucket
+SAMPLE_OVERSAMPLE = 32
+
+# quick_sort finishes ranges this short with insertion sort,
+# and picks pivots by ninther on ranges at least NINTHER_THRESHOLD long
+INSERTION_THRESHOLD = 16
+NINTHER_THRESHOLD = 128
+
+# natural_merge_sort starts galloping after one run wins this many times in a row
+MIN_GALLOP = 7
+
+# sort_rows uses sorting networks for rows up to this width;
+# NumPy's own row-wise sort overtakes them on wider rows
+NETWORK_MAX_WIDTH = 4
+
+# Default memory budget (bytes of line objects per sorted run) and merge
+# width for external_sort
+EXTERNAL_RUN_BYTES = 64 * 2**20
+EXTERNAL_FAN_IN = 64
+
+
+def _digit_at(i: int, num_string: str) -> int:
+    return int(num_string[i])
 
 
 def radix_sort(arr: list[int]) -> list[int]:
@@ -17,39 +59,115 @@ def radix_sort(arr: list[int]) -> list[int]:
         num_strings[i] = num_strings[i].zfill(k)
 
     for i in reversed(range(k)):
-        keyed = [(int(num_string[i]), num_string) for num_string in num_strings]
-        sorted_keyed = counting_sort(keyed)
-        num_strings = [pair[1] for pair in sorted_keyed]
+        num_strings = counting_sort(num_strings, functools.partial(_digit_at, i), (0, 9))
 
     return list(map(int, num_strings))
 
 
-def counting_sort(arr: PairList) -> PairList:
-    """arr is array of tuples each of whose first element is its key"""
+def radix_sort_numpy(arr) -> np.ndarray:
+    """Implement LSD radix sort on a NumPy integer array (or array.array)
+
+    Each pass sorts on one byte of the keys, so an n-byte integer type
+    needs at most n passes and no per-element string conversion.
+    Negative numbers are handled by flipping the sign bit, which maps
+    signed integers onto unsigned integers of the same order.
+    The result has the dtype (including byte order) of the input.
+    """
 
-    keys = [item[0] for item in arr]
+    values = np.asarray(arr)
+    if values.ndim != 1:
+        raise ValueError('radix_sort_numpy expects a one-dimensional array')
+    if values.dtype.kind not in 'iub':
+        raise TypeError('radix_sort_numpy expects an integer array')
 
-    n = len(arr)
-    k = max(keys) + 1
+    # Bytes are extracted from native-order keys; bools sort as 0 and 1
+    dtype = values.dtype
+    values = values.astype(dtype.newbyteorder('='), copy=False)
+    if dtype.kind == 'b':
+        values = values.astype(np.uint8)
 
-    count: list[int] = k * [0]
-    output = n * [(0, '')]
+    n = len(values)
+    if n <= 1:
+        return values.astype(dtype)
 
-    # count becomes histogram
-    for key in keys:
-        count[key] += 1
+    itemsize = values.dtype.itemsize
+    unsigned = np.dtype(f'u{itemsize}')
+    keys = values.view(unsigned)
+    if values.dtype.kind == 'i':
+        keys = keys ^ unsigned.type(1 << (8 * itemsize - 1))
+    else:
+        keys = keys.copy()
 
-    # count becomes running total
-    for i in range(1, k):
-        count[i] += count[i-1]
+    for shift in range(0, 8 * itemsize, 8):
+        digits = ((keys >> unsigned.type(shift)) & unsigned.type(0xFF)).astype(np.uint8)
 
-    # create sorted array
-    for item in reversed(arr):
-        # key = get_key(item)
-        count[item[0]] -= 1
-        output[count[item[0]]] = item
+        # count becomes histogram; a pass where every key shares
+        # one digit would leave the order unchanged, so skip it
+        count = np.bincount(digits, minlength=256)
+        if count.max() == n:
+            continue
 
-    return output
+        # NumPy's stable sort of uint8 keys is itself a counting sort
+        # (histogram, running total, scatter) executed in C
+        keys = keys[np.argsort(digits, kind='stable')]
+
+    if values.dtype.kind == 'i':
+        keys = keys ^ unsigned.type(1 << (8 * itemsize - 1))
+    return keys.view(values.dtype).astype(dtype, copy=False)
+
+
+def _counting_order(arr: Iterable[T], key: Callable[[Any], int],
+                    key_range: Optional[tuple[int, int]]) -> np.ndarray:
+    """Stable sorting permutation of arr by integer key, as an int64 array"""
+
+    keys = np.fromiter(map(key, arr), dtype=np.int64)
+    if keys.size == 0:
+        return keys
+
+    low_key, high_key = int(keys.min()), int(keys.max())
+    if key_range is None:
+        min_key, max_key = low_key, high_key
+    else:
+        min_key, max_key = key_range
+        if low_key < min_key or high_key > max_key:
+            outside = low_key if low_key < min_key else high_key
+            raise ValueError(f'Key {outside} is outside key_range {key_range}')
+
+    # Shifted to start at zero, keys fit the narrowest unsigned type, and
+    # NumPy's stable sort of 8- or 16-bit keys is a counting (radix) sort in C
+    slots = (keys - min_key).astype(np.min_scalar_type(max_key - min_key))
+    return np.argsort(slots, kind='stable').astype(np.int64, copy=False)
+
+
+def counting_sort_indices(arr: Iterable[T],
+                          key: Callable[[Any], int] = operator.itemgetter(0),
+                          key_range: Optional[tuple[int, int]] = None) -> array.array:
+    """Stable counting sort returning the sorting permutation
+
+    The result is an array('q') of input positions in sorted order,
+    so records can be reordered (or merely visited) without copying.
+    key and key_range are as for counting_sort.
+    """
+
+    return array.array('q', _counting_order(arr, key, key_range).tobytes())
+
+
+def counting_sort(arr: Iterable[T],
+                  key: Callable[[Any], int] = operator.itemgetter(0),
+                  key_range: Optional[tuple[int, int]] = None) -> list[T]:
+    """Stable counting sort of any iterable by an integer key
+
+    key extracts each item's key and defaults to the item's first element.
+    key_range is the inclusive (min_key, max_key) range of keys; if omitted
+    it is computed from the data. A key outside key_range raises ValueError.
+    """
+
+    items = arr if isinstance(arr, Sequence) else list(arr)
+    order = _counting_order(items, key, key_range)
+
+    # Gathering through an object array avoids a Python-level loop
+    objects = np.fromiter(items, dtype=object, count=len(items))
+    return objects[order].tolist()
 
 
 def bucket_sort(arr: list[int], k: int) -> list[int]:
@@ -70,7 +188,7 @@ def bucket_sort(arr: list[int], k: int) -> list[int]:
     for bucket in buckets:
         bucket.sort()
 
-    return functools.reduce(operator.add, buckets)
+    return list(itertools.chain.from_iterable(buckets))
 
 
 def bubble_sort(arr: list[int]) -> list[int]:
@@ -83,22 +201,228 @@ def bubble_sort(arr: list[int]) -> list[int]:
     return arr
 
 
+def _insertion_sort_range(arr: list, lo: int, hi: int) -> None:
+    """Insertion sort of arr[lo:hi] in place"""
+    for i in range(lo + 1, hi):
+        temp = arr[i]
+        j = i
+        while j > lo and arr[j-1] > temp:
+            arr[j] = arr[j-1]
+            j -= 1
+        arr[j] = temp
+
+
+def _sift_down(arr: list, lo: int, root: int, size: int) -> None:
+    """Restore the max-heap property below root for the heap stored at arr[lo:lo+size]"""
+    temp = arr[lo + root]
+    while (child := 2 * root + 1) < size:
+        if child + 1 < size and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not temp < arr[lo + child]:
+            break
+        arr[lo + root] = arr[lo + child]
+        root = child
+    arr[lo + root] = temp
+
+
+def _heap_sort_range(arr: list, lo: int, hi: int) -> None:
+    """Heap sort of arr[lo:hi] in place"""
+    size = hi - lo
+    for root in reversed(range(size // 2)):
+        _sift_down(arr, lo, root, size)
+    for end in reversed(range(1, size)):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+
+
+def _median_of_three(arr: list, i: int, j: int, k: int) -> int:
+    """Index of the median of arr[i], arr[j] and arr[k]"""
+    if arr[i] < arr[j]:
+        if arr[j] < arr[k]:
+            return j
+        return k if arr[i] < arr[k] else i
+    if arr[i] < arr[k]:
+        return i
+    return k if arr[j] < arr[k] else j
+
+
+def _choose_pivot(arr: list, lo: int, hi: int) -> Any:
+    """Median of three for mid-sized ranges, Tukey's ninther for large ones"""
+    mid = (lo + hi) // 2
+    last = hi - 1
+    if hi - lo < NINTHER_THRESHOLD:
+        return arr[_median_of_three(arr, lo, mid, last)]
+    step = (hi - lo) // 8
+    return arr[_median_of_three(arr,
+                                _median_of_three(arr, lo, lo + step, lo + 2*step),
+                                _median_of_three(arr, mid - step, mid, mid + step),
+                                _median_of_three(arr, last - 2*step, last - step, last))]
+
+
+def _partition3(arr: list, lo: int, hi: int, pivot: Any) -> tuple[int, int]:
+    """Three-way partition of arr[lo:hi] around pivot
+
+    Returns (lt, gt) such that arr[lo:lt] < pivot, arr[lt:gt] == pivot
+    and arr[gt:hi] > pivot.
+    """
+    lt, i, gt = lo, lo, hi
+    while i < gt:
+        elem = arr[i]
+        if elem < pivot:
+            arr[lt], arr[i] = elem, arr[lt]
+            lt += 1
+            i += 1
+        elif pivot < elem:
+            gt -= 1
+            arr[gt], arr[i] = elem, arr[gt]
+        else:
+            i += 1
+    return lt, gt
+
+
+def _introsort_range(arr: list, lo: int, hi: int) -> None:
+    """Introsort of arr[lo:hi] in place, see quick_sort"""
+
+    depth_limit = 2 * (hi - lo).bit_length()
+    stack = [(lo, hi, 0)]
+
+    while stack:
+        lo, hi, depth = stack.pop()
+
+        while hi - lo > INSERTION_THRESHOLD:
+
+            if depth > depth_limit:
+                _heap_sort_range(arr, lo, hi)
+                break
+            depth += 1
+
+            lt, gt = _partition3(arr, lo, hi, _choose_pivot(arr, lo, hi))
+
+            # Defer the larger side and keep working on the smaller one
+            if lt - lo < hi - gt:
+                stack.append((gt, hi, depth))
+                hi = lt
+            else:
+                stack.append((lo, lt, depth))
+                lo = gt
+
+        else:
+            _insertion_sort_range(arr, lo, hi)
+
+
 def quick_sort(arr: list[int]) -> list[int]:
-    """Implement quick sort"""
+    """Implement quick sort as an in-place, iterative introsort
 
-    if not arr:
-        return []
+    Pivots are chosen by median of three (ninther on large ranges) and
+    partitioned three ways, so duplicate-heavy input stays fast.
+    Small ranges are finished by insertion sort, and ranges that recurse
+    deeper than 2*log2(n) fall back to heap sort, bounding the worst case
+    at O(n log n). The smaller side is always sorted first, so the
+    explicit stack holds O(log n) ranges.
+    """
 
-    pivot = arr[0]
-    arr1, arr2 = [], []
+    _introsort_range(arr, 0, len(arr))
+    return arr
 
-    for elem in arr[1:]:
-        if elem < pivot:
-            arr1.append(elem)
+
+def _check_rank(k: int, n: int) -> int:
+    """Normalize a possibly negative rank k into range(n)"""
+    if k < 0:
+        k += n
+    if not 0 <= k < n:
+        raise IndexError('rank out of range')
+    return k
+
+
+def nth_element(arr, k: int):
+    """Rearrange arr in place so that arr[k] is its k-th smallest element
+
+    Every element before position k is <= arr[k] and every element after
+    it is >= arr[k]. Returns arr[k]. Lists use introselect (quickselect
+    with the quick_sort pivoting and a heap sort fallback, O(n) on average);
+    NumPy arrays use their own partition.
+    """
+
+    k = _check_rank(k, len(arr))
+
+    if isinstance(arr, np.ndarray):
+        arr.partition(k)
+        return arr[k]
+
+    lo, hi = 0, len(arr)
+    depth_limit = 2 * hi.bit_length()
+    depth = 0
+
+    while hi - lo > INSERTION_THRESHOLD:
+
+        if depth > depth_limit:
+            _heap_sort_range(arr, lo, hi)
+            return arr[k]
+        depth += 1
+
+        lt, gt = _partition3(arr, lo, hi, _choose_pivot(arr, lo, hi))
+
+        # Only the side containing position k needs more work
+        if k < lt:
+            hi = lt
+        elif k >= gt:
+            lo = gt
         else:
-            arr2.append(elem)
+            return arr[k]
+
+    _insertion_sort_range(arr, lo, hi)
+    return arr[k]
+
+
+def partial_sort(arr, k: int):
+    """Rearrange arr in place so that arr[:k] holds its k smallest elements in order
+
+    The order of the remaining elements is unspecified. Returns arr.
+    """
+
+    n = len(arr)
+    if k <= 0:
+        return arr
+    if k >= n:
+        if isinstance(arr, np.ndarray):
+            arr.sort()
+            return arr
+        return quick_sort(arr)
+
+    nth_element(arr, k - 1)
+    if isinstance(arr, np.ndarray):
+        arr[:k].sort()
+    else:
+        _introsort_range(arr, 0, k)
+    return arr
+
 
-    return quick_sort(arr1) + [pivot] + quick_sort(arr2)
+def top_k(iterable: Iterable, k: int, key: Optional[Callable[[Any], Any]] = None,
+          reverse: bool = False):
+    """Return the k smallest items of iterable in sorted order
+
+    With reverse=True, return the k largest in descending order instead.
+    Items are streamed through a bounded heap, so memory is O(k)
+    regardless of the input size. NumPy arrays without a key are
+    handled by a vectorized partition and return a NumPy array.
+    """
+
+    if k <= 0:
+        return []
+
+    if isinstance(iterable, np.ndarray) and key is None:
+        n = len(iterable)
+        if k >= n:
+            values = np.sort(iterable)
+        elif reverse:
+            values = np.sort(np.partition(iterable, n - k)[n - k:])
+        else:
+            values = np.sort(np.partition(iterable, k - 1)[:k])
+        return values[::-1] if reverse else values
+
+    if reverse:
+        return heapq.nlargest(k, iterable, key=key)
+    return heapq.nsmallest(k, iterable, key=key)
 
 
 def shell_sort(arr: list[int]) -> list[int]:
@@ -208,9 +532,463 @@ def merge_sort_bottom_up(arr: list[int]) -> list[int]:
     return sorted_array
 
 
-if __name__ == '__main__':
+def _min_run(n: int) -> int:
+    """Minimum run length for natural_merge_sort, as chosen by Timsort"""
+    extra = 0
+    while n >= 64:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def _count_run(arr: list, lo: int, hi: int) -> int:
+    """Find the end of the run starting at lo, reversing it if it descends
+
+    Only strictly descending runs are reversed, which keeps the sort stable.
+    """
+
+    run_hi = lo + 1
+    if run_hi == hi:
+        return hi
+
+    if arr[run_hi] < arr[lo]:
+        while run_hi + 1 < hi and arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+        i, j = lo, run_hi - 1
+        while i < j:
+            arr[i], arr[j] = arr[j], arr[i]
+            i += 1
+            j -= 1
+    else:
+        while run_hi + 1 < hi and not arr[run_hi + 1] < arr[run_hi]:
+            run_hi += 1
+        run_hi += 1
+
+    return run_hi
+
+
+def _binary_insertion_sort(arr: list, lo: int, hi: int, start: int) -> None:
+    """Extend the sorted range arr[lo:start] to arr[lo:hi] by binary insertion"""
+    for i in range(start, hi):
+        pivot = arr[i]
+        position = bisect.bisect_right(arr, pivot, lo, i)
+        arr[position + 1:i + 1] = arr[position:i]
+        arr[position] = pivot
+
+
+def _merge_runs_in_place(arr: list, lo: int, mid: int, hi: int, buffer: list) -> None:
+    """Stably merge the adjacent sorted runs arr[lo:mid] and arr[mid:hi]
+
+    Only the left run is copied out, into the reusable buffer.
+    Once either run wins MIN_GALLOP times in a row, the merge switches to
+    galloping: it binary-searches for the whole block that run wins next
+    and moves it at once.
+    """
+
+    # Elements already in their final place need not be touched
+    lo = bisect.bisect_right(arr, arr[mid], lo, mid)
+    if lo == mid:
+        return
+    hi = bisect.bisect_left(arr, arr[mid - 1], mid, hi)
+
+    left_length = mid - lo
+    if len(buffer) < left_length:
+        buffer.extend((left_length - len(buffer)) * [None])
+    buffer[:left_length] = arr[lo:mid]
+
+    i, j, k = 0, mid, lo
+    while i < left_length and j < hi:
+
+        # Compare one element at a time until one run keeps winning
+        left_wins = right_wins = 0
+        while i < left_length and j < hi and max(left_wins, right_wins) < MIN_GALLOP:
+            if arr[j] < buffer[i]:
+                arr[k] = arr[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                arr[k] = buffer[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
+
+        if i == left_length or j == hi:
+            break
+
+        # Gallop: move the block of left elements <= arr[j] ...
+        end = bisect.bisect_right(buffer, arr[j], i, left_length)
+        arr[k:k + end - i] = buffer[i:end]
+        k += end - i
+        i = end
+        if i == left_length:
+            break
+
+        # ... then the block of right elements < buffer[i]
+        end = bisect.bisect_left(arr, buffer[i], j, hi)
+        arr[k:k + end - j] = arr[j:end]
+        k += end - j
+        j = end
+
+    # Whatever remains of the right run is already in place
+    arr[k:k + left_length - i] = buffer[i:left_length]
+
+
+def _merge_at(arr: list, runs: list[list[int]], i: int, buffer: list) -> None:
+    """Merge runs[i] with runs[i+1]"""
+    base, length = runs[i]
+    next_base, next_length = runs[i + 1]
+    _merge_runs_in_place(arr, base, next_base, next_base + next_length, buffer)
+    runs[i][1] = length + next_length
+    del runs[i + 1]
+
+
+def natural_merge_sort(arr: list[T]) -> list[T]:
+    """Implement an adaptive, run-detecting merge sort (Timsort-style)
+
+    Existing ascending and strictly descending runs are detected and used
+    as they are, short runs are extended by binary insertion, and runs
+    are merged with galloping through a single reusable buffer, keeping
+    the run lengths balanced the way Timsort does.
+    Nearly sorted input therefore sorts in close to O(n).
+    Sorts arr in place and returns it.
+    """
+
+    n = len(arr)
+    min_run = _min_run(n)
+    buffer: list = []
+    runs: list[list[int]] = []
+
+    lo = 0
+    while lo < n:
+
+        end = _count_run(arr, lo, n)
+        if end - lo < min_run:
+            forced_end = min(lo + min_run, n)
+            _binary_insertion_sort(arr, lo, forced_end, end)
+            end = forced_end
+        runs.append([lo, end - lo])
+        lo = end
+
+        # Restore the invariants on the top three run lengths
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i-1][1] <= runs[i][1] + runs[i+1][1]) or \
+                    (i > 1 and runs[i-2][1] <= runs[i-1][1] + runs[i][1]):
+                if runs[i-1][1] < runs[i+1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i+1][1]:
+                break
+            _merge_at(arr, runs, i, buffer)
+
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if i > 0 and runs[i-1][1] < runs[i+1][1]:
+            i -= 1
+        _merge_at(arr, runs, i, buffer)
+
+    return arr
+
 
-    import random
+def _split_bounds(n: int, chunks: int) -> list[tuple[int, int]]:
+    """Split range(n) into chunks contiguous (start, stop) bounds"""
+    step, extra = divmod(n, chunks)
+    bounds = []
+    start = 0
+    for i in range(chunks):
+        stop = start + step + (i < extra)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _sort_chunk(chunk: list) -> list:
+    """Sort one chunk in a worker process, helper for parallel merge sort"""
+    # builtin sorted is a merge sort (Timsort) implemented in C
+    return sorted(chunk)
+
+
+def _sort_shared_chunk(name: str, dtype: str, size: int, start: int, stop: int) -> None:
+    """Sort a slice of a shared-memory NumPy array in place"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view: np.ndarray = np.ndarray((size,), dtype=dtype, buffer=shm.buf)
+        view[start:stop].sort(kind='stable')
+        del view
+    finally:
+        shm.close()
+
+
+def _sort_shared_slices(arr: np.ndarray, bounds: list[tuple[int, int]],
+                        workers: int) -> np.ndarray:
+    """Return a copy of arr with each slice in bounds sorted by a worker process
+
+    The array is handed to the workers through shared memory instead of
+    being pickled.
+    """
+
+    n = len(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    try:
+        shared: np.ndarray = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        shared[:] = arr
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sort_shared_chunk, shm.name, arr.dtype.str, n, start, stop)
+                       for start, stop in bounds]
+            for future in futures:
+                future.result()
+        result = shared.copy()
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+    return result
+
+
+def _merge_sorted_arrays(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Merge two sorted NumPy arrays with vectorized index arithmetic"""
+
+    # Each element of right lands after every element of left that is <= it,
+    # which keeps the merge stable
+    positions = np.searchsorted(left, right, side='right') + np.arange(len(right))
+
+    output = np.empty(len(left) + len(right), dtype=np.result_type(left, right))
+    from_left = np.ones(len(output), dtype=bool)
+    from_left[positions] = False
+    output[positions] = right
+    output[from_left] = left
+    return output
+
+
+def parallel_merge_sort(arr, workers: Optional[int] = None,
+                        threshold: int = PARALLEL_THRESHOLD):
+    """Implement merge sort over a pool of worker processes
+
+    The input is split into one chunk per worker, the chunks are sorted
+    in parallel and the sorted runs are merged: lists with a k-way heap
+    merge, NumPy arrays with pairwise vectorized merges.
+    NumPy input is shared with the workers through shared memory
+    instead of being pickled.
+    Inputs shorter than threshold, or a single worker, are sorted serially.
+    Returns a new list, or a new NumPy array for NumPy input.
+    """
+
+    is_array = isinstance(arr, np.ndarray)
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+
+    if n < threshold or workers <= 1:
+        if is_array:
+            return np.sort(arr, kind='stable')
+        return _sort_chunk(list(arr))
+
+    bounds = _split_bounds(n, workers)
+
+    if not is_array:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            sorted_chunks = list(executor.map(_sort_chunk,
+                                              (arr[start:stop] for start, stop in bounds)))
+        return list(heapq.merge(*sorted_chunks))
+
+    shared = _sort_shared_slices(arr, bounds, workers)
+    runs = [shared[start:stop] for start, stop in bounds]
+
+    # Merge neighbouring runs pairwise until one remains
+    while len(runs) > 1:
+        merged = [_merge_sorted_arrays(runs[i], runs[i+1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0]
+
+
+def sample_sort(arr, buckets: Optional[int] = None, workers: Optional[int] = None,
+                oversample: int = SAMPLE_OVERSAMPLE, threshold: int = PARALLEL_THRESHOLD):
+    """Implement sample sort, a bucket sort with data-driven bucket boundaries
+
+    Bucket boundaries are taken from a sorted random sample of
+    buckets * oversample elements, so buckets come out roughly
+    equal-sized whatever the distribution. The buckets (by default
+    four per worker) are sorted in parallel worker processes and
+    concatenated in a single linear pass.
+    Inputs shorter than threshold, or a single worker, are sorted serially.
+    Returns a new list, or a new NumPy array for NumPy input.
+    """
+
+    is_array = isinstance(arr, np.ndarray)
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    buckets = buckets or 4 * workers
+
+    if n < threshold or workers <= 1 or buckets <= 1:
+        if is_array:
+            return np.sort(arr, kind='stable')
+        return _sort_chunk(list(arr))
+
+    if is_array:
+        sample = np.sort(np.random.default_rng().choice(arr, size=buckets * oversample))
+        splitters = sample[oversample::oversample][:buckets - 1]
+
+        # Group the elements by bucket, then sort each bucket's slice in place
+        bucket_ids = np.searchsorted(splitters, arr, side='right')
+        grouped = arr[np.argsort(bucket_ids, kind='stable')]
+        ends = np.cumsum(np.bincount(bucket_ids, minlength=buckets)).tolist()
+        bounds = [(start, stop) for start, stop in zip([0] + ends[:-1], ends) if start < stop]
+        return _sort_shared_slices(grouped, bounds, workers)
+
+    sample_list = sorted(random.choices(arr, k=buckets * oversample))
+    splitter_list = sample_list[oversample::oversample][:buckets - 1]
+
+    bucket_lists: list[list] = [[] for _ in range(buckets)]
+    for elem in arr:
+        bucket_lists[bisect.bisect_right(splitter_list, elem)].append(elem)
+
+    output: list = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for sorted_bucket in executor.map(_sort_chunk, bucket_lists):
+            output.extend(sorted_bucket)
+    return output
+
+
+def _write_run(lines: list[str], directory: str, buffer_size: int) -> str:
+    """Write one sorted run to a temporary file and return its path"""
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, suffix='.run',
+                                     buffering=buffer_size, delete=False) as run_file:
+        run_file.writelines(lines)
+    return run_file.name
+
+
+def _merge_runs(paths: list[str], output: IO[str],
+                key: Optional[Callable[[str], Any]], buffer_size: int) -> None:
+    """Stream a k-way merge of sorted run files into output"""
+    with contextlib.ExitStack() as stack:
+        runs = [stack.enter_context(open(path, encoding='utf-8', buffering=buffer_size))
+                for path in paths]
+        output.writelines(heapq.merge(*runs, key=key))
+
+
+def external_sort(input_path: str, output_path: str, *,
+                  key: Optional[Callable[[str], Any]] = int,
+                  max_run_bytes: int = EXTERNAL_RUN_BYTES,
+                  fan_in: int = EXTERNAL_FAN_IN,
+                  buffer_size: int = 2**20,
+                  tmp_dir: Optional[str] = None) -> None:
+    """Sort a newline-delimited file that may be larger than memory
+
+    Records are read lazily and collected into runs whose line objects
+    take at most max_run_bytes (as measured by sys.getsizeof), each of
+    which is sorted in memory and written to a temporary file. Sorting a
+    run also holds its list and sort keys, so peak memory is roughly
+    twice the budget. The runs are then combined with a streaming,
+    stable k-way merge, at most fan_in runs at a time.
+    key is applied to each line (including its newline) to get its sort
+    key; the default sorts lines as integers, and None sorts them as text.
+    Blank lines carry no record and are skipped.
+    All file access goes through buffers of buffer_size bytes.
+    Raises ValueError if max_run_bytes is not positive or fan_in is below 2.
+    """
+
+    if max_run_bytes <= 0:
+        raise ValueError('max_run_bytes must be positive')
+    if fan_in < 2:
+        raise ValueError('fan_in must be at least 2 to merge runs')
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as directory:
+
+        paths: list[str] = []
+        with open(input_path, encoding='utf-8', buffering=buffer_size) as input_file:
+            run: list[str] = []
+            run_bytes = 0
+            for line in input_file:
+                if not line.strip():
+                    continue
+                if not line.endswith('\n'):
+                    line += '\n'
+                run.append(line)
+                run_bytes += sys.getsizeof(line)
+                if run_bytes >= max_run_bytes:
+                    paths.append(_write_run(sorted(run, key=key), directory, buffer_size))
+                    run, run_bytes = [], 0
+            if run:
+                paths.append(_write_run(sorted(run, key=key), directory, buffer_size))
+
+        # Merge groups of runs into longer runs until one pass suffices
+        while len(paths) > fan_in:
+            merged_paths = []
+            for i in range(0, len(paths), fan_in):
+                group = paths[i:i + fan_in]
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                                 suffix='.run', buffering=buffer_size,
+                                                 delete=False) as merged:
+                    _merge_runs(group, merged, key, buffer_size)
+                for path in group:
+                    os.remove(path)
+                merged_paths.append(merged.name)
+            paths = merged_paths
+
+        with open(output_path, 'w', encoding='utf-8', buffering=buffer_size) as output:
+            _merge_runs(paths, output, key, buffer_size)
+
+
+@functools.cache
+def _sorting_network(n: int) -> tuple[tuple[int, int], ...]:
+    """Batcher odd-even merge sorting network for n inputs
+
+    Returns the compare-exchange pairs (low, high) in the order they must
+    be applied. The network is built for the next power of two and pruned,
+    which is valid because the missing inputs would be larger than
+    everything else. For n <= 8 it uses the minimum possible number of
+    comparators.
+    """
+
+    size = 1 << (n - 1).bit_length()
+    pairs = []
+    p = 1
+    while p < size:
+        k = p
+        while k >= 1:
+            for j in range(k % p, size - k, 2 * k):
+                for i in range(min(k, size - j - k)):
+                    if (i + j) // (2 * p) == (i + j + k) // (2 * p) and i + j + k < n:
+                        pairs.append((i + j, i + j + k))
+            k //= 2
+        p *= 2
+    return tuple(pairs)
+
+
+def sort_rows(matrix) -> np.ndarray:
+    """Sort every row of a 2-D NumPy array independently
+
+    Rows up to NETWORK_MAX_WIDTH wide are sorted all at once by a sorting
+    network whose compare-exchanges are np.minimum/np.maximum over whole
+    columns, so the Python-level work depends only on the row width.
+    Wider rows, and float rows containing NaN (which np.minimum would
+    spread), use NumPy's row-wise sort. Returns a new array.
+    """
+
+    values = np.asarray(matrix)
+    if values.ndim != 2:
+        raise ValueError('sort_rows expects a two-dimensional array')
+
+    width = values.shape[1]
+    if width > NETWORK_MAX_WIDTH or values.dtype.kind not in 'biuf':
+        return np.sort(values, axis=1)
+    if values.dtype.kind == 'f' and np.isnan(values).any():
+        return np.sort(values, axis=1)
+
+    # Lay each column of the input out contiguously
+    columns = np.ascontiguousarray(values.T)
+    low_values = np.empty_like(columns[0])
+    for low, high in _sorting_network(width):
+        np.minimum(columns[low], columns[high], out=low_values)
+        np.maximum(columns[low], columns[high], out=columns[high])
+        columns[low] = low_values
+    return np.ascontiguousarray(columns.T)
+
+
+if __name__ == '__main__':
 
     list_1 = [random.randint(0, 10000) for _ in range(50)]
     list_2 = [random.randint(0, 10000) for _ in range(32)]
@@ -227,4 +1005,118 @@ if __name__ == '__main__':
             assert sort_function(list_2) == sorted_list_2
         print(f'{sort_function.__name__}() test passes')
 
+    int_array = np.random.randint(-10**12, 10**12, size=1000, dtype=np.int64)
+    assert np.array_equal(radix_sort_numpy(int_array), np.sort(int_array))
+    small_array = array.array('h', (random.randint(-300, 300) for _ in range(500)))
+    assert radix_sort_numpy(small_array).tolist() == sorted(small_array)
+    big_endian = np.random.randint(-1000, 1000, size=50).astype('>i4')
+    assert radix_sort_numpy(big_endian).dtype == big_endian.dtype
+    assert np.array_equal(radix_sort_numpy(big_endian), np.sort(big_endian))
+    bools = np.random.randint(0, 2, size=50).astype(bool)
+    assert radix_sort_numpy(bools).dtype == bool
+    assert np.array_equal(radix_sort_numpy(bools), np.sort(bools))
+    print('radix_sort_numpy() test passes')
+
+    records = [(random.randint(-5, 5), f'record {i}') for i in range(200)]
+    assert counting_sort(records) == sorted(records, key=operator.itemgetter(0))
+    priorities = counting_sort_indices(iter(records), key=lambda record: record[0] + 5,
+                                       key_range=(0, 10))
+    assert [records[i] for i in priorities] == sorted(records, key=operator.itemgetter(0))
+    for out_of_range in [[(-1, 'a'), (3, 'b')], [(6, 'a'), (3, 'b')]]:
+        try:
+            counting_sort(out_of_range, key_range=(0, 5))
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f'Key outside key_range sorted: {out_of_range}')
+    print('counting_sort() and counting_sort_indices() tests pass')
+
+    big_list = [random.randint(0, 10**6) for _ in range(5000)]
+    assert parallel_merge_sort(big_list, workers=4, threshold=1000) == sorted(big_list)
+    big_array = np.random.randint(-10**6, 10**6, size=5001)
+    assert np.array_equal(parallel_merge_sort(big_array, workers=3, threshold=1000),
+                          np.sort(big_array))
+    assert parallel_merge_sort(list_2, workers=4) == sorted_list_2
+    print('parallel_merge_sort() test passes')
+
+    with tempfile.TemporaryDirectory() as test_dir:
+        unsorted_path = os.path.join(test_dir, 'unsorted.txt')
+        sorted_path = os.path.join(test_dir, 'sorted.txt')
+        with open(unsorted_path, 'w', encoding='utf-8') as unsorted_file:
+            unsorted_file.write('\n'.join(map(str, big_list)) + '\n\n \n')
+        external_sort(unsorted_path, sorted_path, max_run_bytes=1000, fan_in=4)
+        with open(sorted_path, encoding='utf-8') as sorted_file:
+            assert list(map(int, sorted_file)) == sorted(big_list)
+        for bad_fan_in, bad_run_bytes in [(1, 1000), (4, 0)]:
+            try:
+                external_sort(unsorted_path, sorted_path,
+                              max_run_bytes=bad_run_bytes, fan_in=bad_fan_in)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f'external_sort accepted fan_in={bad_fan_in}, '
+                                     f'max_run_bytes={bad_run_bytes}')
+    print('external_sort() test passes')
+
+    for adversarial in (list(range(5000)), list(range(5000, 0, -1)), 2500 * [3, 1],
+                        [random.randint(0, 3) for _ in range(5000)]):
+        assert quick_sort(adversarial.copy()) == sorted(adversarial)
+    print('quick_sort() adversarial input test passes')
+
+    selection_list = [random.randint(0, 1000) for _ in range(2001)]
+    selection_array = np.array(selection_list)
+    median = sorted(selection_list)[1000]
+    assert nth_element(selection_list.copy(), 1000) == median
+    assert nth_element(selection_array.copy(), 1000) == median
+    assert partial_sort(selection_list.copy(), 50)[:50] == sorted(selection_list)[:50]
+    assert partial_sort(selection_array.copy(), 50)[:50].tolist() == sorted(selection_list)[:50]
+    assert top_k(iter(selection_list), 10) == sorted(selection_list)[:10]
+    assert top_k(selection_list, 10, reverse=True) == sorted(selection_list, reverse=True)[:10]
+    assert top_k(selection_array, 10).tolist() == sorted(selection_list)[:10]
+    assert top_k(selection_array, 10, reverse=True).tolist() == \
+        sorted(selection_list, reverse=True)[:10]
+    print('nth_element(), partial_sort() and top_k() tests pass')
+
+    for row_width in range(1, 21):
+        rows = np.random.randint(0, 50, size=(300, row_width))
+        assert np.array_equal(sort_rows(rows), np.sort(rows, axis=1))
+        network_rows = np.ascontiguousarray(rows.T)
+        for low_index, high_index in _sorting_network(row_width):
+            network_rows[[low_index, high_index]] = np.sort(network_rows[[low_index, high_index]],
+                                                             axis=0)
+        assert np.array_equal(network_rows.T, np.sort(rows, axis=1))
+    nan_rows = np.array([[np.nan, 1., .5], [3., 2., 1.]])
+    assert np.array_equal(sort_rows(nan_rows), np.sort(nan_rows, axis=1), equal_nan=True)
+    print('sort_rows() test passes')
+
+    nearly_sorted = list(range(10000))
+    for _ in range(20):
+        swap_i, swap_j = random.randrange(10000), random.randrange(10000)
+        nearly_sorted[swap_i], nearly_sorted[swap_j] = nearly_sorted[swap_j], nearly_sorted[swap_i]
+    for unsorted in (nearly_sorted, big_list, list(range(3000, 0, -1)), 1000 * [2, 1, 1]):
+        assert natural_merge_sort(unsorted.copy()) == sorted(unsorted)
+
+    class KeyOnly:
+        """Compare records by their first element only, to check stability"""
+        def __init__(self, record):
+            self.record = record
+
+        def __lt__(self, other):
+            return self.record[0] < other.record[0]
+
+    stable_records = [(random.randint(0, 5), i) for i in range(3000)]
+    stable_keys = list(map(KeyOnly, stable_records))
+    assert [key.record for key in natural_merge_sort(stable_keys)] == \
+        sorted(stable_records, key=operator.itemgetter(0))
+    print('natural_merge_sort() test passes')
+
+    skewed_list = [int(random.paretovariate(0.5)) for _ in range(5000)]
+    assert sample_sort(skewed_list, workers=3, threshold=1000) == sorted(skewed_list)
+    assert sample_sort(big_list, buckets=7, workers=2, threshold=1000) == sorted(big_list)
+    skewed_array = np.random.zipf(1.5, size=5000)
+    assert np.array_equal(sample_sort(skewed_array, workers=3, threshold=1000),
+                          np.sort(skewed_array))
+    assert bucket_sort(list_2, 4) == sorted_list_2
+    print('sample_sort() test passes')
+
     print(100 * '*')
@@ -0,0 +1,236 @@
+"""Benchmark the algorithms in sorting_algos across input distributions
+
+Run as a script to print (or save) a JSON report, for example:
+    python sorting_benchmark.py --sizes 1000 100000 --instrument --output report.json
+"""
+
+import argparse
+import functools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from typing import Any, NamedTuple, Optional
+
+import numpy as np
+
+import sorting_algos
+
+
+class Algorithm(NamedTuple):
+    """A benchmarked sorting function and the inputs it accepts"""
+    func: Callable
+    uses_array: bool = False
+    comparison_based: bool = True
+    max_size: int = 10**7
+    uses_processes: bool = False
+
+
+def _bucket_sort(arr: list[int]) -> list[int]:
+    return sorting_algos.bucket_sort(arr, max(1, len(arr) // 64))
+
+
+def _counting_sort(arr: list[int]) -> list[int]:
+    return sorting_algos.counting_sort(arr, key=int)
+
+
+ALGORITHMS: dict[str, Algorithm] = {
+    'radix_sort': Algorithm(sorting_algos.radix_sort, comparison_based=False, max_size=10**6),
+    'radix_sort_numpy': Algorithm(sorting_algos.radix_sort_numpy, uses_array=True,
+                                  comparison_based=False),
+    'counting_sort': Algorithm(_counting_sort, comparison_based=False),
+    'bucket_sort': Algorithm(_bucket_sort, comparison_based=False, max_size=10**6),
+    'bubble_sort': Algorithm(sorting_algos.bubble_sort, max_size=3000),
+    'quick_sort': Algorithm(sorting_algos.quick_sort, max_size=10**6),
+    'shell_sort': Algorithm(sorting_algos.shell_sort, max_size=10**5),
+    'merge_sort': Algorithm(sorting_algos.merge_sort, max_size=10**6),
+    'merge_sort_bottom_up': Algorithm(sorting_algos.merge_sort_bottom_up, max_size=10**6),
+    'natural_merge_sort': Algorithm(sorting_algos.natural_merge_sort, max_size=10**6),
+    'parallel_merge_sort': Algorithm(sorting_algos.parallel_merge_sort, uses_processes=True),
+    'parallel_merge_sort_numpy': Algorithm(sorting_algos.parallel_merge_sort, uses_array=True,
+                                           uses_processes=True),
+    'sample_sort': Algorithm(sorting_algos.sample_sort, uses_processes=True),
+    'sample_sort_numpy': Algorithm(sorting_algos.sample_sort, uses_array=True,
+                                   uses_processes=True),
+}
+
+
+def _organ_pipe(n: int, rng: np.random.Generator) -> np.ndarray:
+    del rng
+    rising = np.arange((n + 1) // 2)
+    return np.concatenate((rising, rising[:n // 2][::-1]))
+
+
+DISTRIBUTIONS: dict[str, Callable[[int, np.random.Generator], np.ndarray]] = {
+    'random': lambda n, rng: rng.integers(0, max(n, 1), size=n),
+    'sorted': lambda n, rng: np.arange(n),
+    'reversed': lambda n, rng: np.arange(n)[::-1].copy(),
+    'few_unique': lambda n, rng: rng.integers(0, 16, size=n),
+    'organ_pipe': _organ_pipe,
+    'zipf': lambda n, rng: np.minimum(rng.zipf(1.5, size=n), 10**9),
+}
+
+
+class CountingKey:
+    """Wrap a value so that every comparison made on it is counted"""
+
+    __slots__ = ('value',)
+    comparisons = 0
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: 'CountingKey') -> bool:
+        CountingKey.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other: 'CountingKey') -> bool:
+        CountingKey.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other: 'CountingKey') -> bool:
+        CountingKey.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other: 'CountingKey') -> bool:
+        CountingKey.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other: object) -> bool:
+        CountingKey.comparisons += 1
+        return isinstance(other, CountingKey) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+
+class CountingList(list):
+    """List that counts element writes (swaps and moves) into itself
+
+    Only writes into the list handed to the algorithm are counted,
+    not writes into copies or slices it makes internally.
+    """
+
+    writes = 0
+
+    def __setitem__(self, index, value) -> None:
+        CountingList.writes += 1
+        super().__setitem__(index, value)
+
+
+def _run(algorithm: Algorithm, data: np.ndarray) -> tuple[Any, float]:
+    arr = data.copy() if algorithm.uses_array else data.tolist()
+    start = time.perf_counter()
+    result = algorithm.func(arr)
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(algorithm: Algorithm, data: np.ndarray) -> int:
+    arr = data.copy() if algorithm.uses_array else data.tolist()
+    tracemalloc.start()
+    try:
+        algorithm.func(arr)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _instrumented_counts(algorithm: Algorithm, data: np.ndarray) -> dict[str, int]:
+    CountingKey.comparisons = 0
+    CountingList.writes = 0
+    algorithm.func(CountingList(map(CountingKey, data.tolist())))
+    return {'comparisons': CountingKey.comparisons, 'writes': CountingList.writes}
+
+
+def benchmark(algorithms: Optional[Sequence[str]] = None,
+              distributions: Optional[Sequence[str]] = None,
+              sizes: Sequence[int] = (1000, 10_000, 100_000), *,
+              instrument: bool = False,
+              measure_memory: bool = True,
+              seed: int = 0) -> dict[str, Any]:
+    """Benchmark sorting algorithms and return a JSON-serializable report
+
+    Every algorithm runs on every distribution at every size up to its
+    max_size, and each result records wall time, whether the output was
+    correctly sorted and, if measure_memory is True, peak traced memory.
+    With instrument=True, comparison-based algorithms also run on
+    wrapped inputs that count comparisons and element writes.
+    Algorithms that work in a process pool get neither memory nor
+    instrumentation records, since only the parent process is observed.
+    """
+
+    names = list(algorithms or ALGORITHMS)
+    report: dict[str, Any] = {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'seed': seed,
+        'results': [],
+    }
+
+    for distribution in distributions or DISTRIBUTIONS:
+        for size in sizes:
+            data = DISTRIBUTIONS[distribution](size, np.random.default_rng(seed))
+            expected = np.sort(data)
+
+            for name in names:
+                algorithm = ALGORITHMS[name]
+                if size > algorithm.max_size:
+                    continue
+
+                record: dict[str, Any] = {
+                    'algorithm': name,
+                    'distribution': distribution,
+                    'size': size,
+                }
+                try:
+                    result, seconds = _run(algorithm, data)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    record['error'] = f'{type(error).__name__}: {error}'
+                    report['results'].append(record)
+                    continue
+                record['seconds'] = seconds
+                record['correct'] = bool(np.array_equal(np.asarray(result), expected))
+                observable = not algorithm.uses_processes
+                if measure_memory and observable:
+                    record['peak_bytes'] = _peak_memory(algorithm, data)
+                if (instrument and observable and algorithm.comparison_based
+                        and not algorithm.uses_array):
+                    record.update(_instrumented_counts(algorithm, data))
+                report['results'].append(record)
+
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point"""
+
+    parser = argparse.ArgumentParser(description='Benchmark sorting_algos')
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS))
+    parser.add_argument('--distributions', nargs='+', choices=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10_000, 100_000])
+    parser.add_argument('--instrument', action='store_true',
+                        help='count comparisons and writes of comparison sorts')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the tracemalloc peak-memory run')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = benchmark(args.algorithms, args.distributions, args.sizes,
+                       instrument=args.instrument, measure_memory=not args.no_memory,
+                       seed=args.seed)
+
+    dump = functools.partial(json.dump, report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            dump(output)
+    else:
+        dump(sys.stdout)
+        print()
+
+
+if __name__ == '__main__':
+    main()
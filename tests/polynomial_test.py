@@ -1,7 +1,11 @@
 '''Unittest for Polynomial class'''
 
+import gc
+import time
 import unittest
-from polynomial import Polynomial
+from fractions import Fraction
+import numpy as np
+from polynomial import FactorCache, Polynomial, SparsePolynomial
 
 class TestPolynomial(unittest.TestCase):
     '''Unittest for Polynomial class'''
@@ -20,6 +24,37 @@ class TestPolynomial(unittest.TestCase):
         with self.assertRaises(TypeError):
             Polynomial(self.poly1(4, 2))
 
+    def test_call_many(self):
+        '''Test evaluating polynomial at many points at once'''
+        points = [-3, 0, 0.5, 4]
+        expected = [self.poly2(point) for point in points]
+        np.testing.assert_allclose(self.poly2(np.array(points)), expected)
+        np.testing.assert_allclose(self.poly2(points), expected)
+        self.assertEqual(self.poly2(np.zeros((2, 3))).shape, (2, 3))
+        int_points = list(range(-10, 11))
+        self.assertEqual(self.poly2.evaluate_many(int_points, method='subproduct').tolist(),
+                         [self.poly2(point) for point in int_points])
+        fractional = Polynomial(Fraction(1, 3), 2, Fraction(-5, 7))
+        self.assertEqual(fractional(iter([1, 2])).tolist(), [fractional(1), fractional(2)])
+        with self.assertRaises(ValueError):
+            self.poly1.evaluate_many(points, method='naive')
+        cubic = Polynomial(1, 0, 0, 1)
+        self.assertEqual(cubic(np.array([10**6, -7])).tolist(), [cubic(10**6), cubic(-7)])
+
+    def test_compile(self):
+        '''Test compiling polynomial to a specialized evaluation function'''
+        compiled = self.poly2.compile()
+        self.assertIs(self.poly2.compile(), compiled)
+        for point in (-3, 0, 0.5, 4, Fraction(2, 3), 1j):
+            self.assertEqual(compiled(point), self.poly2(point))
+        np.testing.assert_allclose(compiled(np.linspace(-2, 2, 9)),
+                                   self.poly2(np.linspace(-2, 2, 9)))
+        exact = Polynomial(Fraction(1, 3), 0, 2 ** 400)
+        self.assertEqual(exact.compile()(3), exact(3))
+        self.assertEqual(Polynomial(0, 0, 2).compile()(3), 18)
+        self.assertEqual(Polynomial(5).compile()(np.zeros(3)).tolist(), [5, 5, 5])
+        self.assertEqual(SparsePolynomial({1_000_000: 1, 0: 1}).compile()(1), 2)
+
     def test_constructor(self):
         '''Test class constructor raises appropriate Exception with non-numeric argument'''
         with self.assertRaises(TypeError):
@@ -63,6 +98,90 @@ class TestPolynomial(unittest.TestCase):
     def test_exponent(self):
         '''Test raising polynomial to power'''
         self.assertEqual(self.poly1 ** 2, Polynomial(1, -6, 13, -12, 4))
+        self.assertEqual(self.poly1 ** 0, Polynomial(1))
+        self.assertEqual(self.poly1 ** 1, self.poly1)
+        repeated = Polynomial(1)
+        for _ in range(13):
+            repeated *= self.poly2
+        self.assertEqual(self.poly2 ** 13, repeated)
+        with self.assertRaises(ValueError):
+            self.poly1 ** -1
+
+    def test_binomial_exponent(self):
+        '''Test raising monomials and binomials to powers'''
+        binomial = Polynomial(0, 3, 0, -2)
+        repeated = Polynomial(1)
+        for _ in range(9):
+            repeated *= binomial
+        self.assertEqual(binomial ** 9, repeated)
+        self.assertEqual(Polynomial(0, 0, 2) ** 5, Polynomial(*[0] * 10, 32))
+        self.assertEqual(Polynomial(1, 1) ** 4, Polynomial(1, 4, 6, 4, 1))
+        self.assertEqual((Polynomial(1, 1, backend='numpy') ** 4).backend, 'numpy')
+
+    def test_modular_exponent(self):
+        '''Test pow(polynomial, exponent, modulus)'''
+        modulus = Polynomial(3, 0, 1, 1)
+        expected = self.poly2
+        for _ in range(6):
+            expected = Polynomial._divmod(expected * self.poly2, modulus)[1]
+        self.assertEqual(pow(self.poly2, 7, modulus), expected)
+        self.assertEqual(pow(self.poly2, 0, modulus), Polynomial(1))
+        self.assertEqual(pow(self.poly1, 5, 1), Polynomial(0))
+
+    def test_division(self):
+        '''Test floor division, modulo and divmod'''
+        quotient, remainder = divmod(self.poly2, self.poly1)
+        self.assertEqual(quotient, Polynomial(Fraction(-39, 8), Fraction(-3, 4), Fraction(-5, 2)))
+        self.assertEqual(remainder, Polynomial(Fraction(95, 8), Fraction(-79, 8)))
+        self.assertEqual(self.poly2 // self.poly1, quotient)
+        self.assertEqual(self.poly2 % self.poly1, remainder)
+        self.assertEqual((self.poly1 * self.poly2) // self.poly2, self.poly1)
+        self.assertEqual(self.poly1 // 2, Polynomial(Fraction(1, 2), Fraction(-3, 2), 1))
+        self.assertEqual(7 // self.poly1, Polynomial(0))
+        self.assertEqual(7 % self.poly1, Polynomial(7))
+        with self.assertRaises(ZeroDivisionError):
+            divmod(self.poly1, Polynomial(0))
+
+    def test_newton_division(self):
+        '''Test division of long float and GF(p) polynomials by Newton iteration'''
+        rng = np.random.default_rng(0)
+        divisor = Polynomial.from_array(np.append(rng.uniform(-1, 1, 150) / 150, 1.))
+        quotient = Polynomial.from_array(rng.uniform(-1, 1, 200))
+        remainder = Polynomial.from_array(rng.uniform(-1, 1, 150))
+        result = divmod(quotient * divisor + remainder, divisor)
+        np.testing.assert_allclose(result[0].coeffs, quotient.coeffs, atol=1e-8)
+        np.testing.assert_allclose(result[1].coeffs, remainder.coeffs, atol=1e-8)
+
+        prime = 10007
+        divisor = Polynomial.gf(prime, *rng.integers(0, prime, 100).tolist(), 3)
+        quotient = Polynomial.gf(prime, *rng.integers(0, prime, 120).tolist())
+        remainder = Polynomial.gf(prime, *rng.integers(0, prime, 100).tolist())
+        self.assertEqual(divmod(quotient * divisor + remainder, divisor), (quotient, remainder))
+
+    def test_gcd(self):
+        '''Test polynomial greatest common divisors'''
+        self.assertEqual(self.poly2.gcd(self.poly1), Polynomial(1))
+        self.assertEqual((self.poly1 * self.poly2).gcd(self.poly1 ** 2), self.poly1)
+        self.assertEqual((6 * self.poly1 * self.poly2).gcd(-4 * self.poly1 ** 2), 2 * self.poly1)
+        self.assertEqual(self.poly1.gcd(0), self.poly1)
+        self.assertEqual(Polynomial(Fraction(1, 2), Fraction(-3, 2), 1).gcd(Polynomial(-1, 1)),
+                         Polynomial(-1, 1))
+        floats = Polynomial(1., -3., 2.).gcd(Polynomial(1., -2.) * Polynomial(-1., 3.))
+        np.testing.assert_allclose(floats.coeffs, [-0.5, 1])
+
+    def test_prime_field(self):
+        '''Test arithmetic with coefficients in GF(p)'''
+        poly1, poly2 = Polynomial.gf(7, 1, 2, 3), Polynomial.gf(7, 5, 1)
+        self.assertEqual(poly1 * poly2, Polynomial.gf(7, 5, 4, 3, 3))
+        self.assertEqual(poly1 + 6, Polynomial.gf(7, 0, 2, 3))
+        self.assertEqual(divmod(poly1 * poly2 + 1, poly2), (poly1, Polynomial.gf(7, 1)))
+        self.assertEqual((poly1 * poly2).gcd(poly2 ** 2), Polynomial.gf(7, 5, 1))
+        self.assertEqual(Polynomial.gf(7, 2, 4).gcd(Polynomial.gf(7, 3, 6)), Polynomial.gf(7, 4, 1))
+        with self.assertRaises(ValueError):
+            Polynomial.gf(8, 1, 1)
+        self.assertNotEqual(Polynomial.gf(7, 1), Polynomial(8))
+        self.assertEqual(Polynomial.gf(7, 8), Polynomial(1))
+        self.assertEqual(hash(Polynomial.gf(7, 8)), hash(Polynomial(1)))
 
     def test_negation(self):
         '''Test negating polynomial'''
@@ -83,6 +202,83 @@ class TestPolynomial(unittest.TestCase):
         expected = Polynomial(0, 0, 0, 11, 0, -4)
         self.assertEqual(Polynomial.from_map(coeff_dict), expected)
 
+    def test_sparse(self):
+        '''Test sparse polynomials and their interoperation with dense ones'''
+        sparse = SparsePolynomial({1_000_000: 1, 0: 1})
+        self.assertEqual(sparse.order, 1_000_000)
+        self.assertEqual(sparse.terms, {0: 1, 1_000_000: 1})
+        self.assertEqual((sparse[0], sparse[1], sparse[-1]), (1, 0, 1))
+        self.assertEqual(repr(sparse), '1 + 1x^1000000')
+        self.assertEqual(sparse(2), 2 ** 1_000_000 + 1)
+        self.assertEqual(sparse(np.array([0., 1., -1.])).tolist(), [1., 2., 2.])
+        self.assertEqual(SparsePolynomial({100: 1})(np.array([3])).tolist(), [3 ** 100])
+        halved = SparsePolynomial({100: 0.5})
+        self.assertEqual(halved(np.array([True, 2])).tolist(), [0.5, 2. ** 99])
+
+        squared = sparse * sparse
+        self.assertIsInstance(squared, SparsePolynomial)
+        self.assertEqual(squared.terms, {0: 1, 1_000_000: 2, 2_000_000: 1})
+        self.assertEqual(sparse ** 3, squared * sparse)
+        self.assertEqual((sparse - SparsePolynomial({1_000_000: 1})).backend, 'list')
+        self.assertEqual(self.poly1 + sparse, SparsePolynomial({0: 2, 1: -3, 2: 2, 1_000_000: 1}))
+        self.assertEqual((self.poly1 * sparse).terms, {0: 1, 1: -3, 2: 2, 1_000_000: 1,
+                                                       1_000_001: -3, 1_000_002: 2})
+        self.assertEqual(2 - sparse, SparsePolynomial({0: 1, 1_000_000: -1}))
+        self.assertEqual(sparse.derivative, SparsePolynomial({999_999: 1_000_000}))
+
+        small = SparsePolynomial({0: 1, 1: -3, 2: 2})
+        self.assertEqual(small, self.poly1)
+        self.assertEqual(self.poly1, small)
+        self.assertEqual(hash(small), hash(self.poly1))
+        self.assertEqual(small * self.poly2, self.poly1 * self.poly2)
+        self.assertIsInstance(Polynomial.from_map({0: 1, 500: 2}), SparsePolynomial)
+        self.assertNotIsInstance(Polynomial.from_map({0: 1, 5: 2}), SparsePolynomial)
+        with self.assertRaises(ValueError):
+            SparsePolynomial({-1: 1})
+
+    def test_interpolate(self):
+        '''Test building polynomials through points'''
+        xs = [-2, 0, 1, 3, 4]
+        ys = [self.poly2(x) for x in xs]
+        for method in ('newton', 'lagrange', 'fast'):
+            self.assertEqual(Polynomial.interpolate(xs, ys, method=method), self.poly2)
+            self.assertEqual(Polynomial.interpolate([Fraction(1, 2), 3], [1, 2], method=method),
+                             Polynomial(Fraction(4, 5), Fraction(2, 5)))
+            floats = Polynomial.interpolate(np.array(xs, dtype=float), ys, method=method)
+            self.assertEqual(floats.backend, 'numpy')
+            np.testing.assert_allclose(floats.coeffs, self.poly2.coeffs, atol=1e-9)
+            field = Polynomial.gf(101, 3, 0, 7, 1)
+            points = [Polynomial.gf(101, x)[0] for x in range(4)]
+            self.assertEqual(Polynomial.interpolate(points, [field(x) for x in points],
+                                                    method=method), field)
+        self.assertEqual(Polynomial.interpolate([2], [5]), Polynomial(5))
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate([1, 1], [2, 3])
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate([1, 2], [2])
+        with self.assertRaises(ValueError):
+            Polynomial.interpolate(xs, ys, method='spline')
+
+    def test_fit(self):
+        '''Test least-squares fitting of one and many curves'''
+        xs = np.linspace(-1, 1, 40)
+        np.testing.assert_allclose(Polynomial.fit(xs, self.poly1(xs), 2).coeffs, [1, -3, 2])
+        np.testing.assert_allclose(Polynomial.fit(xs, self.poly1(xs), 4).coeffs,
+                                   [1, -3, 2, 0, 0], atol=1e-12)
+        curves = np.stack([self.poly1(xs) + shift for shift in range(3)], axis=1)
+        fits = Polynomial.fit(xs, curves, 2)
+        self.assertEqual(len(fits), 3)
+        for shift, fit in enumerate(fits):
+            np.testing.assert_allclose(fit.coeffs, [1 + shift, -3, 2])
+        curve_xs = np.stack([xs, 2 * xs, xs + 1], axis=1)
+        for fit in Polynomial.fit(curve_xs, self.poly1(curve_xs), 2, weights=curve_xs ** 2):
+            np.testing.assert_allclose(fit.coeffs, [1, -3, 2])
+        noisy = self.poly1(xs) + np.where(np.arange(40) % 2, 0.1, -0.1)
+        np.testing.assert_allclose(Polynomial.fit(xs, noisy, 0).coeffs,
+                                   [np.mean(self.poly1(xs))])
+        with self.assertRaises(ValueError):
+            Polynomial.fit(xs, curves[:10], 2)
+
     def test_derivative(self):
         '''Test "derivative" property'''
         deriv = self.poly1.derivative
@@ -108,6 +304,128 @@ class TestPolynomial(unittest.TestCase):
         self.assertEqual(product.factorization(), [self.poly1, self.poly2])
         cubed = self.poly1 ** 3
         self.assertEqual(cubed.factorization(), [self.poly1, self.poly1, self.poly1])
+        binomial = Polynomial(1, 1)
+        self.assertEqual((binomial ** 3).factorization(), 3 * [binomial])
+        monomial = Polynomial(0, 0, 2)
+        self.assertEqual((monomial ** 6).factorization(), 6 * [monomial])
+        recorded = len(Polynomial.factors)
+        sparse = SparsePolynomial({0: 1, 10**7: 1})
+        start = time.perf_counter()
+        self.assertEqual((sparse ** 2).terms, {0: 1, 10**7: 2, 2 * 10**7: 1})
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(len(Polynomial.factors), recorded)
+
+    def test_exact_factorization(self):
+        '''Test complete factorization over the rationals'''
+        linear1, linear2 = Polynomial(-1, 1), Polynomial(-1, 2)
+        self.assertEqual(self.poly1.factorization(method='exact'), [linear1, linear2])
+        product = 3 * self.poly1 ** 2 * self.poly2 * Polynomial(0, 1)
+        self.assertEqual(product.factorization(method='exact'),
+                         [Polynomial(-3), linear1, linear1, linear2, linear2,
+                          Polynomial(0, 1), -self.poly2])
+        self.assertEqual(Polynomial(-1, 0, 0, 0, 1).factorization(method='auto'),
+                         [linear1, Polynomial(1, 1), Polynomial(1, 0, 1)])
+        self.assertEqual(Polynomial(Fraction(1, 2), 0, Fraction(-1, 2)).factorization('exact'),
+                         [Polynomial(Fraction(-1, 2)), linear1, Polynomial(1, 1)])
+        irreducible = Polynomial(1, 0, -10, 0, 1)
+        self.assertEqual(irreducible.factorization(method='exact'), [irreducible])
+        self.assertEqual(Polynomial(5).factorization(method='exact'), [Polynomial(5)])
+        self.assertEqual((self.poly1 ** 3 * Polynomial(0, 1)).square_free_decomposition(),
+                         [(Polynomial(0, 1), 1), (self.poly1, 3)])
+        with self.assertRaises(TypeError):
+            Polynomial(1.5, 1).factorization(method='exact')
+        with self.assertRaises(ValueError):
+            self.poly1.factorization(method='magic')
+
+    def test_roots(self):
+        '''Test numerical root finding and factorization'''
+        expected = np.sort_complex(np.roots(self.poly2.coeffs[::-1]))
+        for method in ('eig', 'aberth'):
+            np.testing.assert_allclose(np.sort_complex(self.poly2.roots(method)), expected)
+            np.testing.assert_allclose(np.sort_complex(Polynomial(0, 0, 2, 2).roots(method)),
+                                       [-1, 0, 0], atol=1e-12)
+        factors = Polynomial(2., -2., 2., -2.).factorization(method='numeric')
+        self.assertEqual(len(factors), 3)
+        self.assertEqual(factors[0], Polynomial(-2.))
+        np.testing.assert_allclose(factors[1].coeffs, [-1, 1])
+        np.testing.assert_allclose(factors[2].coeffs, [1, 0, 1], atol=1e-12)
+        self.assertEqual(Polynomial(1j, 1).factorization(method='auto'), [Polynomial(1j, 1)])
+
+    def test_numpy_backend(self):
+        '''Test array-backed polynomials behave like list-backed ones'''
+        poly1 = Polynomial(1, -3, 2, backend='numpy')
+        poly2 = Polynomial.from_array(np.array([7., 4., -10., 6., -5.]))
+        self.assertEqual(poly1.backend, 'numpy')
+        self.assertEqual(poly2.backend, 'numpy')
+        self.assertIsInstance(poly1.coeffs, np.ndarray)
+        self.assertEqual(poly1, self.poly1)
+        self.assertEqual(hash(poly1), hash(self.poly1))
+        self.assertEqual(poly1 + poly2, self.poly1 + self.poly2)
+        self.assertEqual(poly1 * poly2, self.poly1 * self.poly2)
+        self.assertEqual((poly1 * poly2).backend, 'numpy')
+        self.assertEqual(poly1 - 7, self.poly1 - 7)
+        self.assertEqual(poly1 ** 2, self.poly1 ** 2)
+        self.assertEqual(poly1.derivative, self.poly1.derivative)
+        self.assertEqual(poly1(4), 21)
+        self.assertEqual(repr(poly1), '1.0 + -3.0x + 2.0x^2')
+        self.assertEqual(Polynomial(1, 0, 0, backend='numpy').order, 0)
+
+    def test_numpy_backend_fallback(self):
+        '''Test exact coefficients stay in the list backend'''
+        fractional = Polynomial(Fraction(1, 3), 2, backend='numpy')
+        self.assertEqual(fractional.backend, 'list')
+        self.assertEqual(Polynomial(2 ** 80, 1, backend='numpy').backend, 'list')
+        self.assertEqual(Polynomial.from_array(np.array([2 ** 62, 1])).backend, 'list')
+        mixed = fractional + Polynomial(1.5, backend='numpy')
+        self.assertEqual(mixed.backend, 'list')
+        self.assertAlmostEqual(mixed[0], 1.5 + 1 / 3)
+        with self.assertRaises(ValueError):
+            Polynomial(1, backend='tuple')
+
+    def test_fast_multiplication(self):
+        '''Test Kronecker, Karatsuba and FFT products match schoolbook multiplication'''
+        ints1 = [(-1) ** i * (i * 7919 % 1000) ** 3 for i in range(300)]
+        ints2 = [(i * 104729 % 997) - 498 for i in range(201)]
+        expected = [0] * 500
+        for i, coeff1 in enumerate(ints1):
+            for j, coeff2 in enumerate(ints2):
+                expected[i + j] += coeff1 * coeff2
+        self.assertEqual((Polynomial(*ints1) * Polynomial(*ints2)).coeffs, expected)
+        fractions1 = [Fraction(coeff, 3) for coeff in ints1]
+        self.assertEqual((Polynomial(*fractions1) * Polynomial(*ints2)).coeffs,
+                         [Fraction(coeff, 3) for coeff in expected])
+        floats1 = Polynomial.from_array(np.array(ints1 * 2, dtype=float) / 1e6)
+        floats2 = Polynomial.from_array(np.array(ints2 * 4, dtype=float))
+        np.testing.assert_allclose((floats1 * floats2).coeffs,
+                                   np.convolve(floats1.coeffs, floats2.coeffs), atol=1e-6)
+
+    def test_factor_cache(self):
+        '''Test the factor registry is bounded, weak and reports statistics'''
+        original = Polynomial.factors
+        try:
+            Polynomial.factors = FactorCache(maxsize=2)
+            product1 = self.poly1 * self.poly2
+            product2 = self.poly1 * self.poly1
+            product3 = self.poly2 * self.poly2
+            self.assertEqual(len(Polynomial.factors), 2)
+            self.assertNotIn(product1, Polynomial.factors)
+            self.assertEqual(product3.factorization(), [self.poly2, self.poly2])
+            self.assertEqual(product1.factorization(), [product1])
+            info = Polynomial.factors.cache_info()
+            self.assertEqual((info.maxsize, info.currsize), (2, 2))
+            self.assertGreaterEqual(info.hits, 1)
+            self.assertGreaterEqual(info.misses, 1)
+
+            del product2, product3
+            gc.collect()
+            self.assertEqual(len(Polynomial.factors), 0)
+
+            Polynomial.factors = FactorCache(maxsize=0)
+            product = self.poly1 * self.poly2
+            self.assertEqual(len(Polynomial.factors), 0)
+            self.assertEqual(product.factorization(), [product])
+        finally:
+            Polynomial.factors = original
 
 if __name__ == '__main__':
     unittest.main()